@@ -1,13 +1,29 @@
+import logging
+import re
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional, Union
 from config import Config
-import sys
 from urllib.parse import quote
 
+# Debug trace goes through the api package logger set up in api.chatbot
+logger = logging.getLogger(__name__)
+
+# Subgenus/author info in parentheses, stripped from scientific names
+_PARENTHETICAL_RE = re.compile(r'\([^)]*\)')
+
+
 class BiocacheService:
     def __init__(self):
         self.base_url = Config.BIOCACHE_BASE_URL
         self.dataset_id = Config.DATASET_ID
+        
+        # One pooled session so repeated ALA calls reuse keep-alive TLS connections.
+        # The routes and the chatbot share one instance, so the pool covers the
+        # gunicorn request threads plus the chatbot's concurrent tool calls.
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=32))
     
     def search_occurrences(self, 
                           filters: Optional[Dict] = None, 
@@ -17,16 +33,17 @@ class BiocacheService:
                           lat: Optional[float] = None,
                           lon: Optional[float] = None,
                           radius: Optional[float] = None,
-                          show_only_with_images: bool = True) -> Dict:
+                          show_only_with_images: bool = True,
+                          extra_fq: Optional[List[str]] = None) -> Dict:
         """
         Enhanced search occurrences with support for comprehensive filtering
         including higher taxonomy ranks (class, order, etc.)
+        extra_fq: raw Solr filter queries appended as-is (used by search_occurrences_bulk)
         """
-        print(f"[BiocacheService] search_occurrences called with:")
-        print(f"[BiocacheService]   show_only_with_images={show_only_with_images}")
-        print(f"[BiocacheService]   lat={lat}, lon={lon}, radius={radius}")
-        print(f"[BiocacheService]   filters={filters}")
-        sys.stdout.flush()
+        logger.debug(
+            "search_occurrences called with show_only_with_images=%s, lat=%s, lon=%s, radius=%s, filters=%s",
+            show_only_with_images, lat, lon, radius, filters
+        )
         
         # Build filter query array
         fq = []
@@ -38,7 +55,7 @@ class BiocacheService:
         if bounds:
             fq.append(f'decimalLatitude:[{bounds["south"]} TO {bounds["north"]}]')
             fq.append(f'decimalLongitude:[{bounds["west"]} TO {bounds["east"]}]')
-            print(f"[BiocacheService] Searching with bounds: lat [{bounds['south']} TO {bounds['north']}], lon [{bounds['west']} TO {bounds['east']}]")
+            logger.debug("Searching with bounds: lat [%s TO %s], lon [%s TO %s]", bounds['south'], bounds['north'], bounds['west'], bounds['east'])
         
         # Add user filters
         if filters:
@@ -51,56 +68,56 @@ class BiocacheService:
             # Handle class filter (e.g., Aves for birds, Reptilia for reptiles)
             if filters.get('class'):
                 fq.append(f'class:"{filters["class"]}"')
-                print(f"[BiocacheService] Using class field for: {filters['class']}")
+                logger.debug("Using class field for: %s", filters['class'])
                 higher_taxonomy_used = True
             
             # Handle order filter (e.g., Squamata for snakes/lizards)
             if filters.get('order'):
                 fq.append(f'order:"{filters["order"]}"')
-                print(f"[BiocacheService] Using order field for: {filters['order']}")
+                logger.debug("Using order field for: %s", filters['order'])
                 higher_taxonomy_used = True
             
             # Handle family filter
             if filters.get('family') and not filters.get('scientific_name'):
                 fq.append(f'family:"{filters["family"]}"')
-                print(f"[BiocacheService] Using family field for: {filters['family']}")
+                logger.debug("Using family field for: %s", filters['family'])
                 higher_taxonomy_used = True
             
             # Handle genus filter
             if filters.get('genus') and not filters.get('scientific_name'):
                 fq.append(f'genus:"{filters["genus"]}"')
-                print(f"[BiocacheService] Using genus field for: {filters['genus']}")
+                logger.debug("Using genus field for: %s", filters['genus'])
                 higher_taxonomy_used = True
             
             # Handle kingdom filter
             if filters.get('kingdom'):
                 fq.append(f'kingdom:"{filters["kingdom"]}"')
-                print(f"[BiocacheService] Using kingdom field for: {filters['kingdom']}")
+                logger.debug("Using kingdom field for: %s", filters['kingdom'])
                 higher_taxonomy_used = True
             
             # Handle phylum filter
             if filters.get('phylum'):
                 fq.append(f'phylum:"{filters["phylum"]}"')
-                print(f"[BiocacheService] Using phylum field for: {filters['phylum']}")
+                logger.debug("Using phylum field for: %s", filters['phylum'])
                 higher_taxonomy_used = True
             
             # Handle infraclass filter (e.g., Marsupialia)
             if filters.get('infraclass'):
                 # Note: ALA may not have infraclass field, try class or use broader search
                 fq.append(f'(infraclass:"{filters["infraclass"]}" OR scientificName:*{filters["infraclass"]}*)')
-                print(f"[BiocacheService] Using infraclass search for: {filters['infraclass']}")
+                logger.debug("Using infraclass search for: %s", filters['infraclass'])
                 higher_taxonomy_used = True
             
             # Handle subphylum filter (e.g., Crustacea)
             if filters.get('subphylum'):
                 fq.append(f'(subphylum:"{filters["subphylum"]}" OR phylum:"{filters["subphylum"]}")')
-                print(f"[BiocacheService] Using subphylum search for: {filters['subphylum']}")
+                logger.debug("Using subphylum search for: %s", filters['subphylum'])
                 higher_taxonomy_used = True
             
             # Handle subclass filter (e.g., Acari for mites)
             if filters.get('subclass'):
                 fq.append(f'(subclass:"{filters["subclass"]}" OR class:"{filters["subclass"]}")')
-                print(f"[BiocacheService] Using subclass search for: {filters['subclass']}")
+                logger.debug("Using subclass search for: %s", filters['subclass'])
                 higher_taxonomy_used = True
             
             # =============================================================
@@ -116,8 +133,7 @@ class BiocacheService:
                     scientific_name = ' '.join(scientific_name.split())
                     
                     # Remove subgenus/author info in parentheses
-                    import re
-                    scientific_name = re.sub(r'\([^)]*\)', '', scientific_name).strip()
+                    scientific_name = _PARENTHETICAL_RE.sub('', scientific_name).strip()
                     scientific_name = ' '.join(scientific_name.split())
                     
                     rank = self.determine_taxonomic_rank(scientific_name)
@@ -127,28 +143,28 @@ class BiocacheService:
                     if len(parts) >= 2 and len(parts[0]) > 0 and len(parts[1]) > 0:
                         if parts[0][0].isupper() and parts[1][0].islower():
                             rank = 'species'
-                            print(f"[BiocacheService] FORCED to species rank for binomial: {scientific_name}")
+                            logger.debug("FORCED to species rank for binomial: %s", scientific_name)
                     
                     if rank == 'species':
                         fq.append(f'species:"{scientific_name}"')
-                        print(f"[BiocacheService] Using species field for: {scientific_name}")
+                        logger.debug("Using species field for: %s", scientific_name)
                     elif rank == 'genus':
                         genus_name = scientific_name.split()[0] if ' ' in scientific_name else scientific_name
                         fq.append(f'genus:"{genus_name}"')
-                        print(f"[BiocacheService] Using genus field for: {genus_name}")
+                        logger.debug("Using genus field for: %s", genus_name)
                     elif rank == 'family':
                         fq.append(f'family:"{scientific_name}"')
-                        print(f"[BiocacheService] Using family field for: {scientific_name}")
+                        logger.debug("Using family field for: %s", scientific_name)
                     else:
                         fq.append(f'(order:"{scientific_name}" OR class:"{scientific_name}" OR phylum:"{scientific_name}" OR kingdom:"{scientific_name}")')
-                        print(f"[BiocacheService] Using higher taxonomy search for: {scientific_name}")
+                        logger.debug("Using higher taxonomy search for: %s", scientific_name)
                 
                 # Common name search - use vernacularName field with WILDCARD for partial matching
                 elif filters.get('common_name'):
                     common_name = filters['common_name']
                     # Use wildcard for better matching (e.g., *snake* matches "Red-naped snake")
                     fq.append(f'vernacularName:*{common_name}*')
-                    print(f"[BiocacheService] Using vernacularName WILDCARD for: *{common_name}*")
+                    logger.debug("Using vernacularName WILDCARD for: *%s*", common_name)
             
             # =============================================================
             # GEOGRAPHIC FILTERS
@@ -199,6 +215,9 @@ class BiocacheService:
             if filters.get('has_image'):
                 fq.append('multimedia:Image')
         
+        if extra_fq:
+            fq.extend(extra_fq)
+        
         # Build the main query
         q = '*:*'
         
@@ -224,16 +243,16 @@ class BiocacheService:
             params['lon'] = lon
             if radius is not None:
                 params['radius'] = radius
-            print(f"[BiocacheService] ✓ Added spatial params: lat={lat}, lon={lon}, radius={radius}")
+            logger.debug("✓ Added spatial params: lat=%s, lon=%s, radius=%s", lat, lon, radius)
         else:
-            print(f"[BiocacheService] ⚠ No spatial params added")
+            logger.debug("⚠ No spatial params added")
         
-        print(f"[BiocacheService] Query filters: {fq}")
-        print(f"[BiocacheService] API params keys: {list(params.keys())}")
+        logger.debug("Query filters: %s", fq)
+        logger.debug("API params keys: %s", list(params.keys()))
         
-        response = requests.get(f"{self.base_url}/occurrences/search", params=params, timeout=60)
+        response = self.session.get(f"{self.base_url}/occurrences/search", params=params, timeout=60)
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
         
         # Process occurrences
         processed_occurrences = []
@@ -243,10 +262,9 @@ class BiocacheService:
                 processed_occurrences.append(processed)
         
         total_records = data.get('totalRecords', 0)
-        print(f"[BiocacheService] Query result: {total_records} total records, returning {len(processed_occurrences)} records")
+        logger.debug("Query result: %s total records, returning %s records", total_records, len(processed_occurrences))
         
-        print(f"[BiocacheService] About to build URL with filters: {filters}")
-        sys.stdout.flush()
+        logger.debug("About to build URL with filters: %s", filters)
         
         # Build the ALA URL for user reference
         ala_url = self.build_ala_url(filters, bounds)
@@ -258,6 +276,54 @@ class BiocacheService:
             'ala_url': ala_url
         }
     
+    def search_occurrences_bulk(self,
+                                filters: Optional[Dict],
+                                areas: List[Dict],
+                                page_size: int = 500,
+                                show_only_with_images: bool = True) -> Dict:
+        """
+        Search several areas in one request instead of one request per area.
+        Each area is a dict with state, latitude, longitude and radius (km); the
+        areas are OR-ed together into a single filter query, e.g.
+        (stateProvince:"NSW" AND {!geofilt ...}) OR (stateProvince:"VIC" AND ...)
+        Occurrences come back grouped by area, in the order the areas were given.
+        Raises requests.HTTPError if the backend rejects the combined query.
+        """
+        clauses = []
+        for area in areas:
+            geofilt = f'_query_:"{{!geofilt sfield=location pt={area["latitude"]},{area["longitude"]} d={area["radius"]}}}"'
+            if area.get('state'):
+                clauses.append(f'(stateProvince:"{area["state"]}" AND {geofilt})')
+            else:
+                clauses.append(f'({geofilt})')
+        
+        base_filters = dict(filters or {})
+        base_filters.pop('state_province', None)
+        
+        results = self.search_occurrences(
+            filters=base_filters,
+            page=0,
+            page_size=page_size,
+            show_only_with_images=show_only_with_images,
+            extra_fq=[' OR '.join(clauses)]
+        )
+        
+        # Regroup rows by area so callers see the same ordering as a per-area fan-out
+        by_state = {}
+        for occ in results['occurrences']:
+            by_state.setdefault(occ.get('stateProvince'), []).append(occ)
+        
+        grouped = []
+        for area in areas:
+            grouped.extend(by_state.pop(area.get('state'), []))
+        for leftover in by_state.values():
+            grouped.extend(leftover)
+        
+        results['occurrences'] = grouped
+        # The website can't express the OR-ed point searches - link the filters alone
+        results['ala_url'] = self.build_ala_url(base_filters)
+        return results
+    
     def determine_taxonomic_rank(self, name: str) -> str:
         """
         Determine the taxonomic rank of a scientific name
@@ -266,48 +332,40 @@ class BiocacheService:
         name = name.strip()
         name = ' '.join(name.split())
         
-        import re
-        name = re.sub(r'\([^)]*\)', '', name).strip()
+        name = _PARENTHETICAL_RE.sub('', name).strip()
         name = ' '.join(name.split())
         
         parts = name.split()
         
-        print(f"[BiocacheService] determine_taxonomic_rank input (after cleaning): '{name}'")
-        print(f"[BiocacheService] Parts: {parts}, Length: {len(parts)}")
-        sys.stdout.flush()
+        logger.debug("determine_taxonomic_rank input (after cleaning): '%s'", name)
+        logger.debug("Parts: %s, Length: %s", parts, len(parts))
         
         # Check for family and higher ranks by suffix
         if self._is_higher_taxon(name):
-            print(f"[BiocacheService] Detected as FAMILY (higher taxon)")
-            sys.stdout.flush()
+            logger.debug("Detected as FAMILY (higher taxon)")
             return 'family'
         
         # Check for binomial (species level)
         if len(parts) >= 2:
-            print(f"[BiocacheService] Has {len(parts)} parts")
-            sys.stdout.flush()
+            logger.debug("Has %s parts", len(parts))
             
             if len(parts[0]) > 0 and len(parts[1]) > 0:
                 first_char = parts[0][0]
                 second_char = parts[1][0]
                 
-                print(f"[BiocacheService] First part '{parts[0]}' starts with '{first_char}' (isupper={first_char.isupper()})")
-                print(f"[BiocacheService] Second part '{parts[1]}' starts with '{second_char}' (islower={second_char.islower()})")
-                sys.stdout.flush()
+                logger.debug("First part '%s' starts with '%s' (isupper=%s)", parts[0], first_char, first_char.isupper())
+                logger.debug("Second part '%s' starts with '%s' (islower=%s)", parts[1], second_char, second_char.islower())
                 
                 if first_char.isupper() and second_char.islower():
-                    print(f"[BiocacheService] ✓ Detected as SPECIES (binomial)")
-                    sys.stdout.flush()
+                    logger.debug("✓ Detected as SPECIES (binomial)")
                     return 'species'
         
         # Single capitalized word = genus
         if len(parts) == 1 and len(name) > 0 and name[0].isupper():
-            print(f"[BiocacheService] Detected as GENUS (single word)")
-            sys.stdout.flush()
+            logger.debug("Detected as GENUS (single word)")
             return 'genus'
         
-        print(f"[BiocacheService] Defaulting to HIGHER taxonomy")
-        sys.stdout.flush()
+        logger.debug("Defaulting to HIGHER taxonomy")
         return 'higher'
     
     def get_statistics(self, filters: Optional[Dict] = None) -> Dict:
@@ -337,9 +395,9 @@ class BiocacheService:
         """Get a specific specimen by its UUID or catalog number"""
         # Try UUID first
         try:
-            response = requests.get(f"{self.base_url}/occurrence/{specimen_id}", timeout=30)
+            response = self.session.get(f"{self.base_url}/occurrence/{specimen_id}", timeout=30)
             if response.status_code == 200:
-                return self._process_occurrence(response.json())
+                return self._process_occurrence(orjson.loads(response.content))
         except:
             pass
         
@@ -403,73 +461,48 @@ class BiocacheService:
                 if filters.get('scientific_name'):
                     name = filters['scientific_name']
                     
-                    import os
-                    log_path = os.path.join(os.getcwd(), 'biocache_debug.log')
-                    with open(log_path, 'a') as f:
-                        f.write(f"\n=== build_ala_url DEBUG ===\n")
-                        f.write(f"Input name: '{name}'\n")
+                    logger.debug("build_ala_url: input name '%s'", name)
                     
                     name = name.strip()
                     name = ' '.join(name.split())
                     
-                    import re
-                    name = re.sub(r'\([^)]*\)', '', name).strip()
+                    name = _PARENTHETICAL_RE.sub('', name).strip()
                     name = ' '.join(name.split())
                     
-                    with open(log_path, 'a') as f:
-                        f.write(f"After clean: '{name}'\n")
-                        f.write(f"Split parts: {name.split()}\n")
+                    logger.debug("build_ala_url: after clean '%s'", name)
                     
                     parts = name.split()
                     if len(parts) >= 2 and len(parts[0]) > 0 and len(parts[1]) > 0:
                         if parts[0][0].isupper() and parts[1][0].islower():
                             rank = 'species'
-                            with open(log_path, 'a') as f:
-                                f.write(f"FORCED to species rank (defensive check passed)\n")
-                            print(f"[BiocacheService] build_ala_url: FORCED to species rank for binomial: {name}")
+                            logger.debug("build_ala_url: FORCED to species rank for binomial: %s", name)
                         else:
                             rank = self.determine_taxonomic_rank(name)
-                            with open(log_path, 'a') as f:
-                                f.write(f"Using determine_taxonomic_rank, got: {rank}\n")
                     else:
                         rank = self.determine_taxonomic_rank(name)
-                        with open(log_path, 'a') as f:
-                            f.write(f"Less than 2 parts, using determine_taxonomic_rank: {rank}\n")
-                    
-                    with open(log_path, 'a') as f:
-                        f.write(f"Final rank: {rank}\n")
                     
-                    print(f"[BiocacheService] build_ala_url: scientific_name='{name}', taxonomic rank = {rank}")
-                    sys.stdout.flush()
+                    logger.debug("build_ala_url: scientific_name='%s', taxonomic rank = %s", name, rank)
                     
                     if rank == 'species':
                         encoded_name = quote(name, safe='')
                         url_param = f'fq=species:%22{encoded_name}%22'
-                        with open(log_path, 'a') as f:
-                            f.write(f"Building URL param: {url_param}\n")
-                        print(f"[BiocacheService] build_ala_url: Using species: for {name}")
+                        logger.debug("build_ala_url: Using species: for %s", name)
                         params.append(url_param)
                     elif rank == 'genus':
                         genus_name = name.split()[0] if ' ' in name else name
                         encoded_genus = quote(genus_name, safe='')
                         url_param = f'fq=genus:%22{encoded_genus}%22'
-                        with open(log_path, 'a') as f:
-                            f.write(f"Building URL param: {url_param}\n")
-                        print(f"[BiocacheService] build_ala_url: Using genus: for {genus_name}")
+                        logger.debug("build_ala_url: Using genus: for %s", genus_name)
                         params.append(url_param)
                     elif rank == 'family':
                         encoded_name = quote(name, safe='')
                         url_param = f'fq=family:%22{encoded_name}%22'
-                        with open(log_path, 'a') as f:
-                            f.write(f"Building URL param: {url_param}\n")
-                        print(f"[BiocacheService] build_ala_url: Using family: for {name}")
+                        logger.debug("build_ala_url: Using family: for %s", name)
                         params.append(url_param)
                     else:
                         encoded_name = quote(name, safe='')
                         url_param = f'fq=order:%22{encoded_name}%22'
-                        with open(log_path, 'a') as f:
-                            f.write(f"Building URL param: {url_param}\n")
-                        print(f"[BiocacheService] build_ala_url: Using order/class/phylum for {name}")
+                        logger.debug("build_ala_url: Using order/class/phylum for %s", name)
                         params.append(url_param)
                 
                 elif filters.get('common_name'):
@@ -591,14 +624,14 @@ class BiocacheService:
             if not hasattr(self, '_debug_count'):
                 self._debug_count = 0
             if self._debug_count < 3:
-                print(f"[BiocacheService] Specimen {occurrence.get('id')}: has_image={has_image}")
+                logger.debug("Specimen %s: has_image=%s", occurrence.get('id'), has_image)
                 self._debug_count += 1
             
             if not has_image:
                 return False
         else:
             if not hasattr(self, '_debug_no_filter_logged'):
-                print(f"[BiocacheService] NOT filtering by images")
+                logger.debug("NOT filtering by images")
                 self._debug_no_filter_logged = True
         
         return True
@@ -5,166 +5,271 @@ ENHANCED: Now includes geocoding support for suburb-level queries
 FIXED: Proper handling of generic animal terms (bird, snake, fish, etc.)
 """
 import base64
-from typing import Dict, List, Optional
-import json
+import hashlib
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+import logging
+import operator
 import re
+import sqlite3
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType, SimpleNamespace
+from cachetools import TTLCache
+import orjson
+import httpx
+import redis
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from openai import OpenAI
 from config import Config
 from api.biocache import BiocacheService
 from api.response_cleaner import ResponseCleaner
 from api.geocoding import GeocodingService
 
+# Handlers for the "api" package loggers are attached in create_app
+logger = logging.getLogger(__name__)
+
+# Shared keep-alive session for ALA BIE name lookups, so repeat lookups skip the TLS handshake
+BIE_SEARCH_URL = "https://bie.ala.org.au/ws/search"
+# Taxon records in the animal kingdom only - BIE filters, so plants named "bird" never come back
+_BIE_ANIMAL_TAXON_FQ = ('idxtype:TAXON', 'kingdom:ANIMALIA')
+_BIE_SESSION = requests.Session()
+# Name lookups are idempotent GETs, so ride out brief BIE overloads with a few jittered retries
+_BIE_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.25,
+        backoff_jitter=0.25,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({'GET'})
+    )
+))
+
+# =============================================================
+# GENERIC ANIMAL TERMS MAPPING
+# Maps common/casual animal terms to their correct taxonomic rank and value
+# This prevents ALA BIE from returning wrong results (e.g., plants named "bird")
+# =============================================================
+GENERIC_ANIMAL_TERMS = MappingProxyType({
+    # Birds
+    'bird': {'rank': 'class', 'value': 'Aves'},
+    'birds': {'rank': 'class', 'value': 'Aves'},
+    
+    # Reptiles - Snakes and Lizards
+    'snake': {'rank': 'order', 'value': 'Squamata'},  # Squamata includes snakes and lizards
+    'snakes': {'rank': 'order', 'value': 'Squamata'},
+    'lizard': {'rank': 'order', 'value': 'Squamata'},
+    'lizards': {'rank': 'order', 'value': 'Squamata'},
+    'reptile': {'rank': 'class', 'value': 'Reptilia'},
+    'reptiles': {'rank': 'class', 'value': 'Reptilia'},
+    'turtle': {'rank': 'order', 'value': 'Testudines'},
+    'turtles': {'rank': 'order', 'value': 'Testudines'},
+    'tortoise': {'rank': 'order', 'value': 'Testudines'},
+    'tortoises': {'rank': 'order', 'value': 'Testudines'},
+    'crocodile': {'rank': 'order', 'value': 'Crocodylia'},
+    'crocodiles': {'rank': 'order', 'value': 'Crocodylia'},
+    
+    # Amphibians
+    'frog': {'rank': 'order', 'value': 'Anura'},
+    'frogs': {'rank': 'order', 'value': 'Anura'},
+    'amphibian': {'rank': 'class', 'value': 'Amphibia'},
+    'amphibians': {'rank': 'class', 'value': 'Amphibia'},
+    'toad': {'rank': 'order', 'value': 'Anura'},
+    'toads': {'rank': 'order', 'value': 'Anura'},
+    
+    # Mammals
+    'mammal': {'rank': 'class', 'value': 'Mammalia'},
+    'mammals': {'rank': 'class', 'value': 'Mammalia'},
+    'bat': {'rank': 'order', 'value': 'Chiroptera'},
+    'bats': {'rank': 'order', 'value': 'Chiroptera'},
+    'rodent': {'rank': 'order', 'value': 'Rodentia'},
+    'rodents': {'rank': 'order', 'value': 'Rodentia'},
+    'whale': {'rank': 'order', 'value': 'Cetacea'},
+    'whales': {'rank': 'order', 'value': 'Cetacea'},
+    'dolphin': {'rank': 'order', 'value': 'Cetacea'},
+    'dolphins': {'rank': 'order', 'value': 'Cetacea'},
+    'marsupial': {'rank': 'infraclass', 'value': 'Marsupialia'},
+    'marsupials': {'rank': 'infraclass', 'value': 'Marsupialia'},
+    
+    # Fish
+    'fish': {'rank': 'class', 'value': 'Actinopterygii'},  # Ray-finned fishes (most common)
+    'fishes': {'rank': 'class', 'value': 'Actinopterygii'},
+    'shark': {'rank': 'class', 'value': 'Chondrichthyes'},  # Cartilaginous fish
+    'sharks': {'rank': 'class', 'value': 'Chondrichthyes'},
+    'ray': {'rank': 'class', 'value': 'Chondrichthyes'},
+    'rays': {'rank': 'class', 'value': 'Chondrichthyes'},
+    
+    # Invertebrates - Insects
+    'insect': {'rank': 'class', 'value': 'Insecta'},
+    'insects': {'rank': 'class', 'value': 'Insecta'},
+    'beetle': {'rank': 'order', 'value': 'Coleoptera'},
+    'beetles': {'rank': 'order', 'value': 'Coleoptera'},
+    'butterfly': {'rank': 'order', 'value': 'Lepidoptera'},
+    'butterflies': {'rank': 'order', 'value': 'Lepidoptera'},
+    'moth': {'rank': 'order', 'value': 'Lepidoptera'},
+    'moths': {'rank': 'order', 'value': 'Lepidoptera'},
+    'bee': {'rank': 'order', 'value': 'Hymenoptera'},
+    'bees': {'rank': 'order', 'value': 'Hymenoptera'},
+    'wasp': {'rank': 'order', 'value': 'Hymenoptera'},
+    'wasps': {'rank': 'order', 'value': 'Hymenoptera'},
+    'ant': {'rank': 'order', 'value': 'Hymenoptera'},
+    'ants': {'rank': 'order', 'value': 'Hymenoptera'},
+    'fly': {'rank': 'order', 'value': 'Diptera'},
+    'flies': {'rank': 'order', 'value': 'Diptera'},
+    'dragonfly': {'rank': 'order', 'value': 'Odonata'},
+    'dragonflies': {'rank': 'order', 'value': 'Odonata'},
+    'grasshopper': {'rank': 'order', 'value': 'Orthoptera'},
+    'grasshoppers': {'rank': 'order', 'value': 'Orthoptera'},
+    'cricket': {'rank': 'order', 'value': 'Orthoptera'},
+    'crickets': {'rank': 'order', 'value': 'Orthoptera'},
+    'cockroach': {'rank': 'order', 'value': 'Blattodea'},
+    'cockroaches': {'rank': 'order', 'value': 'Blattodea'},
+    
+    # Invertebrates - Arachnids
+    'spider': {'rank': 'order', 'value': 'Araneae'},
+    'spiders': {'rank': 'order', 'value': 'Araneae'},
+    'scorpion': {'rank': 'order', 'value': 'Scorpiones'},
+    'scorpions': {'rank': 'order', 'value': 'Scorpiones'},
+    'arachnid': {'rank': 'class', 'value': 'Arachnida'},
+    'arachnids': {'rank': 'class', 'value': 'Arachnida'},
+    'tick': {'rank': 'order', 'value': 'Ixodida'},
+    'ticks': {'rank': 'order', 'value': 'Ixodida'},
+    'mite': {'rank': 'subclass', 'value': 'Acari'},
+    'mites': {'rank': 'subclass', 'value': 'Acari'},
+    
+    # Invertebrates - Crustaceans
+    'crab': {'rank': 'order', 'value': 'Decapoda'},
+    'crabs': {'rank': 'order', 'value': 'Decapoda'},
+    'lobster': {'rank': 'order', 'value': 'Decapoda'},
+    'lobsters': {'rank': 'order', 'value': 'Decapoda'},
+    'shrimp': {'rank': 'order', 'value': 'Decapoda'},
+    'prawn': {'rank': 'order', 'value': 'Decapoda'},
+    'prawns': {'rank': 'order', 'value': 'Decapoda'},
+    'crustacean': {'rank': 'subphylum', 'value': 'Crustacea'},
+    'crustaceans': {'rank': 'subphylum', 'value': 'Crustacea'},
+    
+    # Invertebrates - Molluscs
+    'snail': {'rank': 'class', 'value': 'Gastropoda'},
+    'snails': {'rank': 'class', 'value': 'Gastropoda'},
+    'slug': {'rank': 'class', 'value': 'Gastropoda'},
+    'slugs': {'rank': 'class', 'value': 'Gastropoda'},
+    'octopus': {'rank': 'order', 'value': 'Octopoda'},
+    'squid': {'rank': 'order', 'value': 'Teuthida'},
+    'clam': {'rank': 'class', 'value': 'Bivalvia'},
+    'clams': {'rank': 'class', 'value': 'Bivalvia'},
+    'oyster': {'rank': 'class', 'value': 'Bivalvia'},
+    'oysters': {'rank': 'class', 'value': 'Bivalvia'},
+    'mussel': {'rank': 'class', 'value': 'Bivalvia'},
+    'mussels': {'rank': 'class', 'value': 'Bivalvia'},
+    'mollusc': {'rank': 'phylum', 'value': 'Mollusca'},
+    'molluscs': {'rank': 'phylum', 'value': 'Mollusca'},
+    'mollusk': {'rank': 'phylum', 'value': 'Mollusca'},
+    'mollusks': {'rank': 'phylum', 'value': 'Mollusca'},
+    
+    # Invertebrates - Other
+    'worm': {'rank': 'phylum', 'value': 'Annelida'},
+    'worms': {'rank': 'phylum', 'value': 'Annelida'},
+    'jellyfish': {'rank': 'phylum', 'value': 'Cnidaria'},
+    'coral': {'rank': 'class', 'value': 'Anthozoa'},
+    'corals': {'rank': 'class', 'value': 'Anthozoa'},
+    'starfish': {'rank': 'class', 'value': 'Asteroidea'},
+    'sea star': {'rank': 'class', 'value': 'Asteroidea'},
+    'sea urchin': {'rank': 'class', 'value': 'Echinoidea'},
+    'sea urchins': {'rank': 'class', 'value': 'Echinoidea'},
+    'sponge': {'rank': 'phylum', 'value': 'Porifera'},
+    'sponges': {'rank': 'phylum', 'value': 'Porifera'},
+})
+
+
+@lru_cache(maxsize=2048)
+def _normalize_name(name: str) -> str:
+    """
+    Canonical form of an animal name for generic-term matching and name-cache keys.
+    Memoised because the same argument is normalised on several fallback paths per call.
+    """
+    return name.strip().casefold()
+
+
+_ALL_IMAGE_FIELDS = operator.itemgetter('thumbnailUrl', 'imageUrl', 'largeImageUrl', 'images')
+
+
+def _all_images(occ: Dict) -> Dict:
+    """Image selector for image_quality="all" - every image field of a processed occurrence"""
+    thumbnail, medium, large, all_images = _ALL_IMAGE_FIELDS(occ)
+    return {'thumbnail': thumbnail, 'medium': medium, 'large': large, 'all_images': all_images}
+
+
+class Message:
+    """
+    One stored conversation message. Slots keep long-lived session histories
+    far smaller than per-message dicts; to_openai() builds the API dict on send.
+    """
+    __slots__ = ('role', 'content', 'tool_calls', 'tool_call_id', 'name')
+    
+    def __init__(self, role: str, content=None, tool_calls=None, tool_call_id=None, name=None):
+        self.role = role
+        self.content = content
+        self.tool_calls = tool_calls
+        self.tool_call_id = tool_call_id
+        self.name = name
+    
+    def to_openai(self) -> Dict:
+        """Chat Completions message dict (optional fields only when set)"""
+        message = {"role": self.role, "content": self.content}
+        if self.tool_calls is not None:
+            message["tool_calls"] = self.tool_calls
+        if self.tool_call_id is not None:
+            message["tool_call_id"] = self.tool_call_id
+        if self.name is not None:
+            message["name"] = self.name
+        return message
+    
+    @classmethod
+    def from_openai(cls, message: Dict) -> 'Message':
+        return cls(
+            message["role"],
+            message.get("content"),
+            message.get("tool_calls"),
+            message.get("tool_call_id"),
+            message.get("name")
+        )
+
+
+class _SessionCache(TTLCache):
+    """
+    In-memory session histories. Sessions idle for longer than ttl expire, and the
+    least recently used is evicted when full; both are counted for /health.
+    """
+    
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize, ttl)
+        self.evictions = 0
+        self.expirations = 0
+    
+    def popitem(self):
+        session_id, history = super().popitem()
+        self.evictions += 1
+        logger.debug("Evicted least recently used session %s (%d so far)", session_id, self.evictions)
+        return session_id, history
+    
+    def expire(self, now=None):
+        expired = super().expire(now)
+        if expired:
+            self.expirations += len(expired)
+            logger.debug("Expired %d idle sessions (%d so far)", len(expired), self.expirations)
+        return expired
+
 
 class ChatbotService:
-    def __init__(self):
-        """Initialize the chatbot with OpenAI client and comprehensive tool definitions"""
-        self.client = OpenAI(api_key=Config.OPENAI_API_KEY)
-        self.biocache_service = BiocacheService()
-        self.response_cleaner = ResponseCleaner()
-        self.geocoding_service = GeocodingService()  # NEW: Add geocoding service
-        
-        self.model = "gpt-5-mini"
-        self.conversations = {}
-        self.max_history_length = 20
-        
-        # =============================================================
-        # GENERIC ANIMAL TERMS MAPPING
-        # Maps common/casual animal terms to their correct taxonomic rank and value
-        # This prevents ALA BIE from returning wrong results (e.g., plants named "bird")
-        # =============================================================
-        self.GENERIC_ANIMAL_TERMS = {
-            # Birds
-            'bird': {'rank': 'class', 'value': 'Aves'},
-            'birds': {'rank': 'class', 'value': 'Aves'},
-            
-            # Reptiles - Snakes and Lizards
-            'snake': {'rank': 'order', 'value': 'Squamata'},  # Squamata includes snakes and lizards
-            'snakes': {'rank': 'order', 'value': 'Squamata'},
-            'lizard': {'rank': 'order', 'value': 'Squamata'},
-            'lizards': {'rank': 'order', 'value': 'Squamata'},
-            'reptile': {'rank': 'class', 'value': 'Reptilia'},
-            'reptiles': {'rank': 'class', 'value': 'Reptilia'},
-            'turtle': {'rank': 'order', 'value': 'Testudines'},
-            'turtles': {'rank': 'order', 'value': 'Testudines'},
-            'tortoise': {'rank': 'order', 'value': 'Testudines'},
-            'tortoises': {'rank': 'order', 'value': 'Testudines'},
-            'crocodile': {'rank': 'order', 'value': 'Crocodylia'},
-            'crocodiles': {'rank': 'order', 'value': 'Crocodylia'},
-            
-            # Amphibians
-            'frog': {'rank': 'order', 'value': 'Anura'},
-            'frogs': {'rank': 'order', 'value': 'Anura'},
-            'amphibian': {'rank': 'class', 'value': 'Amphibia'},
-            'amphibians': {'rank': 'class', 'value': 'Amphibia'},
-            'toad': {'rank': 'order', 'value': 'Anura'},
-            'toads': {'rank': 'order', 'value': 'Anura'},
-            
-            # Mammals
-            'mammal': {'rank': 'class', 'value': 'Mammalia'},
-            'mammals': {'rank': 'class', 'value': 'Mammalia'},
-            'bat': {'rank': 'order', 'value': 'Chiroptera'},
-            'bats': {'rank': 'order', 'value': 'Chiroptera'},
-            'rodent': {'rank': 'order', 'value': 'Rodentia'},
-            'rodents': {'rank': 'order', 'value': 'Rodentia'},
-            'whale': {'rank': 'order', 'value': 'Cetacea'},
-            'whales': {'rank': 'order', 'value': 'Cetacea'},
-            'dolphin': {'rank': 'order', 'value': 'Cetacea'},
-            'dolphins': {'rank': 'order', 'value': 'Cetacea'},
-            'marsupial': {'rank': 'infraclass', 'value': 'Marsupialia'},
-            'marsupials': {'rank': 'infraclass', 'value': 'Marsupialia'},
-            
-            # Fish
-            'fish': {'rank': 'class', 'value': 'Actinopterygii'},  # Ray-finned fishes (most common)
-            'fishes': {'rank': 'class', 'value': 'Actinopterygii'},
-            'shark': {'rank': 'class', 'value': 'Chondrichthyes'},  # Cartilaginous fish
-            'sharks': {'rank': 'class', 'value': 'Chondrichthyes'},
-            'ray': {'rank': 'class', 'value': 'Chondrichthyes'},
-            'rays': {'rank': 'class', 'value': 'Chondrichthyes'},
-            
-            # Invertebrates - Insects
-            'insect': {'rank': 'class', 'value': 'Insecta'},
-            'insects': {'rank': 'class', 'value': 'Insecta'},
-            'beetle': {'rank': 'order', 'value': 'Coleoptera'},
-            'beetles': {'rank': 'order', 'value': 'Coleoptera'},
-            'butterfly': {'rank': 'order', 'value': 'Lepidoptera'},
-            'butterflies': {'rank': 'order', 'value': 'Lepidoptera'},
-            'moth': {'rank': 'order', 'value': 'Lepidoptera'},
-            'moths': {'rank': 'order', 'value': 'Lepidoptera'},
-            'bee': {'rank': 'order', 'value': 'Hymenoptera'},
-            'bees': {'rank': 'order', 'value': 'Hymenoptera'},
-            'wasp': {'rank': 'order', 'value': 'Hymenoptera'},
-            'wasps': {'rank': 'order', 'value': 'Hymenoptera'},
-            'ant': {'rank': 'order', 'value': 'Hymenoptera'},
-            'ants': {'rank': 'order', 'value': 'Hymenoptera'},
-            'fly': {'rank': 'order', 'value': 'Diptera'},
-            'flies': {'rank': 'order', 'value': 'Diptera'},
-            'dragonfly': {'rank': 'order', 'value': 'Odonata'},
-            'dragonflies': {'rank': 'order', 'value': 'Odonata'},
-            'grasshopper': {'rank': 'order', 'value': 'Orthoptera'},
-            'grasshoppers': {'rank': 'order', 'value': 'Orthoptera'},
-            'cricket': {'rank': 'order', 'value': 'Orthoptera'},
-            'crickets': {'rank': 'order', 'value': 'Orthoptera'},
-            'cockroach': {'rank': 'order', 'value': 'Blattodea'},
-            'cockroaches': {'rank': 'order', 'value': 'Blattodea'},
-            
-            # Invertebrates - Arachnids
-            'spider': {'rank': 'order', 'value': 'Araneae'},
-            'spiders': {'rank': 'order', 'value': 'Araneae'},
-            'scorpion': {'rank': 'order', 'value': 'Scorpiones'},
-            'scorpions': {'rank': 'order', 'value': 'Scorpiones'},
-            'arachnid': {'rank': 'class', 'value': 'Arachnida'},
-            'arachnids': {'rank': 'class', 'value': 'Arachnida'},
-            'tick': {'rank': 'order', 'value': 'Ixodida'},
-            'ticks': {'rank': 'order', 'value': 'Ixodida'},
-            'mite': {'rank': 'subclass', 'value': 'Acari'},
-            'mites': {'rank': 'subclass', 'value': 'Acari'},
-            
-            # Invertebrates - Crustaceans
-            'crab': {'rank': 'order', 'value': 'Decapoda'},
-            'crabs': {'rank': 'order', 'value': 'Decapoda'},
-            'lobster': {'rank': 'order', 'value': 'Decapoda'},
-            'lobsters': {'rank': 'order', 'value': 'Decapoda'},
-            'shrimp': {'rank': 'order', 'value': 'Decapoda'},
-            'prawn': {'rank': 'order', 'value': 'Decapoda'},
-            'prawns': {'rank': 'order', 'value': 'Decapoda'},
-            'crustacean': {'rank': 'subphylum', 'value': 'Crustacea'},
-            'crustaceans': {'rank': 'subphylum', 'value': 'Crustacea'},
-            
-            # Invertebrates - Molluscs
-            'snail': {'rank': 'class', 'value': 'Gastropoda'},
-            'snails': {'rank': 'class', 'value': 'Gastropoda'},
-            'slug': {'rank': 'class', 'value': 'Gastropoda'},
-            'slugs': {'rank': 'class', 'value': 'Gastropoda'},
-            'octopus': {'rank': 'order', 'value': 'Octopoda'},
-            'squid': {'rank': 'order', 'value': 'Teuthida'},
-            'clam': {'rank': 'class', 'value': 'Bivalvia'},
-            'clams': {'rank': 'class', 'value': 'Bivalvia'},
-            'oyster': {'rank': 'class', 'value': 'Bivalvia'},
-            'oysters': {'rank': 'class', 'value': 'Bivalvia'},
-            'mussel': {'rank': 'class', 'value': 'Bivalvia'},
-            'mussels': {'rank': 'class', 'value': 'Bivalvia'},
-            'mollusc': {'rank': 'phylum', 'value': 'Mollusca'},
-            'molluscs': {'rank': 'phylum', 'value': 'Mollusca'},
-            'mollusk': {'rank': 'phylum', 'value': 'Mollusca'},
-            'mollusks': {'rank': 'phylum', 'value': 'Mollusca'},
-            
-            # Invertebrates - Other
-            'worm': {'rank': 'phylum', 'value': 'Annelida'},
-            'worms': {'rank': 'phylum', 'value': 'Annelida'},
-            'jellyfish': {'rank': 'phylum', 'value': 'Cnidaria'},
-            'coral': {'rank': 'class', 'value': 'Anthozoa'},
-            'corals': {'rank': 'class', 'value': 'Anthozoa'},
-            'starfish': {'rank': 'class', 'value': 'Asteroidea'},
-            'sea star': {'rank': 'class', 'value': 'Asteroidea'},
-            'sea urchin': {'rank': 'class', 'value': 'Echinoidea'},
-            'sea urchins': {'rank': 'class', 'value': 'Echinoidea'},
-            'sponge': {'rank': 'phylum', 'value': 'Porifera'},
-            'sponges': {'rank': 'phylum', 'value': 'Porifera'},
-        }
-        
-        # Simplified system prompt - focus on natural language only
-        self.system_prompt = """You are an AI assistant for the Australian Museum Collection Explorer (OZCAM dataset via ALA Biocache API).
+    # Simplified system prompt - focus on natural language only
+    _SYSTEM_PROMPT = """You are an AI assistant for the Australian Museum Collection Explorer (OZCAM dataset via ALA Biocache API).
 
 ## Your Job
 
@@ -227,247 +332,497 @@ You: Call search_specimens with common_name="frog" (matches any species with "fr
 
 **Example 3:**
 User: "How many frogs are in the collection?"
-You: Call get_specimen_statistics with common_name="frog", then respond naturally like:
-"The collection contains [X] frog specimens. [View on Atlas of Living Australia](ala_url)"
+You: Call get_specimen_statistics with common_name="frog" and count_only=true - the count is reported to the user directly.
+For a plain breakdown ("How many frogs per state?") also pass include_facets=["state_province"].
 
 """
 # - NEVER show or narrate your internal processing, such as JSON, function calls, and your action steps, to the user.
 
-        # Comprehensive tool definitions
-        self.tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "search_specimens",
-                    "description": "Search the OZCAM specimen dataset via ALA Biocache API with comprehensive filtering options",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "scientific_name": {
-                                "type": "string",
-                                "description": "Scientific name at any taxonomic level (species, genus, family, order, class, phylum, kingdom)"
-                            },
-                            "common_name": {
-                                "type": "string",
-                                "description": "Common/vernacular name of the organism"
-                            },
-                            "state_province": {
-                                "type": "string",
-                                "description": "Australian state or territory (full names: 'New South Wales', 'Queensland', 'Victoria', 'Tasmania', 'South Australia', 'Western Australia', 'Northern Territory', 'Australian Capital Territory')"
-                            },
-                            "locality": {
-                                "type": "string",
-                                "description": "Specific location description"
-                            },
-                            "bounds": {
-                                "type": "object",
-                                "properties": {
-                                    "north": {"type": "number"},
-                                    "south": {"type": "number"},
-                                    "east": {"type": "number"},
-                                    "west": {"type": "number"}
-                                },
-                                "description": "Geographic bounding box"
-                            },
-                            "point_radius": {
-                                "type": "object",
-                                "properties": {
-                                    "latitude": {"type": "number"},
-                                    "longitude": {"type": "number"},
-                                    "radius_km": {"type": "number"}
-                                },
-                                "description": "Search within radius of a point"
-                            },
-                            "year": {
-                                "type": "integer",
-                                "description": "Specific year"
-                            },
-                            "year_range": {
-                                "type": "object",
-                                "properties": {
-                                    "start_year": {"type": "integer"},
-                                    "end_year": {"type": "integer"}
-                                },
-                                "description": "Year range (inclusive)"
-                            },
-                            "month": {
-                                "type": "integer",
-                                "minimum": 1,
-                                "maximum": 12,
-                                "description": "Month (1-12)"
-                            },
-                            "catalog_number": {
-                                "type": "string",
-                                "description": "Specimen catalog number"
-                            },
-                            "recorded_by": {
-                                "type": "string",
-                                "description": "Collector name"
-                            },
-                            "identified_by": {
-                                "type": "string",
-                                "description": "Identifier name"
-                            },
-                            "collection_name": {
-                                "type": "string",
-                                "description": "Museum collection name"
-                            },
-                            "institution": {
-                                "type": "string",
-                                "description": "Institution name"
-                            },
-                            #"basis_of_record": {
-                                #"type": "string",
-                                #"enum": ["PRESERVED_SPECIMEN", "HUMAN_OBSERVATION", "LIVING_SPECIMEN", "MACHINE_OBSERVATION"],
-                                #"description": "Record type"
-                            #},
-                            "has_image": {
-                                "type": "boolean",
-                                "description": "Filter by image availability"
-                            },
-                            "image_quality": {
-                                "type": "string",
-                                "enum": ["thumbnail", "medium", "large", "all"],
-                                "description": "Image quality for results (default: thumbnail)"
+    # Prepended to every session's history when calling the model (not stored per session) - treat as read-only
+    _SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}
+
+    # Every request starts with the same tools + system prompt prefix; a fixed cache key
+    # routes them to the same OpenAI prompt cache so that prefix is billed as cached input
+    _PROMPT_CACHE_KEY = "museum-collection-explorer"
+
+    # Comprehensive tool definitions - built once at import and shared by every instance
+    _TOOLS = (
+        {
+            "type": "function",
+            "function": {
+                "name": "search_specimens",
+                "description": "Search the OZCAM specimen dataset via ALA Biocache API with comprehensive filtering options",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "scientific_name": {
+                            "type": "string",
+                            "description": "Scientific name at any taxonomic level (species, genus, family, order, class, phylum, kingdom)"
+                        },
+                        "common_name": {
+                            "type": "string",
+                            "description": "Common/vernacular name of the organism"
+                        },
+                        "state_province": {
+                            "type": "string",
+                            "description": "Australian state or territory (full names: 'New South Wales', 'Queensland', 'Victoria', 'Tasmania', 'South Australia', 'Western Australia', 'Northern Territory', 'Australian Capital Territory')"
+                        },
+                        "locality": {
+                            "type": "string",
+                            "description": "Specific location description"
+                        },
+                        "bounds": {
+                            "type": "object",
+                            "properties": {
+                                "north": {"type": "number"},
+                                "south": {"type": "number"},
+                                "east": {"type": "number"},
+                                "west": {"type": "number"}
                             },
-                            "free_text": {
-                                "type": "string",
-                                "description": "Free text search across all fields"
+                            "description": "Geographic bounding box"
+                        },
+                        "point_radius": {
+                            "type": "object",
+                            "properties": {
+                                "latitude": {"type": "number"},
+                                "longitude": {"type": "number"},
+                                "radius_km": {"type": "number"}
                             },
-                            "sort_by": {
-                                "type": "string",
-                                "enum": ["relevance", "year_asc", "year_desc"],
-                                "description": "Sort order (default: relevance)"
+                            "description": "Search within radius of a point"
+                        },
+                        "year": {
+                            "type": "integer",
+                            "description": "Specific year"
+                        },
+                        "year_range": {
+                            "type": "object",
+                            "properties": {
+                                "start_year": {"type": "integer"},
+                                "end_year": {"type": "integer"}
                             },
-                            "limit": {
-                                "type": "integer",
-                                "minimum": 1,
-                                "maximum": 100,
-                                "description": "Maximum results (default: 10, max: 100)"
-                            }
+                            "description": "Year range (inclusive)"
+                        },
+                        "month": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "maximum": 12,
+                            "description": "Month (1-12)"
+                        },
+                        "catalog_number": {
+                            "type": "string",
+                            "description": "Specimen catalog number"
+                        },
+                        "recorded_by": {
+                            "type": "string",
+                            "description": "Collector name"
+                        },
+                        "identified_by": {
+                            "type": "string",
+                            "description": "Identifier name"
+                        },
+                        "collection_name": {
+                            "type": "string",
+                            "description": "Museum collection name"
+                        },
+                        "institution": {
+                            "type": "string",
+                            "description": "Institution name"
+                        },
+                        #"basis_of_record": {
+                            #"type": "string",
+                            #"enum": ["PRESERVED_SPECIMEN", "HUMAN_OBSERVATION", "LIVING_SPECIMEN", "MACHINE_OBSERVATION"],
+                            #"description": "Record type"
+                        #},
+                        "has_image": {
+                            "type": "boolean",
+                            "description": "Filter by image availability"
+                        },
+                        "image_quality": {
+                            "type": "string",
+                            "enum": ["thumbnail", "medium", "large", "all"],
+                            "description": "Image quality for results (default: thumbnail)"
+                        },
+                        "free_text": {
+                            "type": "string",
+                            "description": "Free text search across all fields"
+                        },
+                        "sort_by": {
+                            "type": "string",
+                            "enum": ["relevance", "year_asc", "year_desc"],
+                            "description": "Sort order (default: relevance)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "minimum": 1,
+                            "maximum": 100,
+                            "description": "Maximum results (default: 10, max: 100)"
+                        },
+                        "compact": {
+                            "type": "boolean",
+                            "description": "Return specimens as a 'columns' list plus 'rows' of values instead of one object per specimen - use for large limits (default: false)"
                         }
                     }
                 }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_specimen_statistics",
-                    "description": "Get statistical summary and distributions for specimens matching search criteria",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "scientific_name": {"type": "string"},
-                            "common_name": {"type": "string"},
-                            "state_province": {"type": "string"},
-                            "year_range": {
-                                "type": "object",
-                                "properties": {
-                                    "start_year": {"type": "integer"},
-                                    "end_year": {"type": "integer"}
-                                }
-                            },
-                            "collection_name": {"type": "string"},
-                            "include_facets": {
-                                "type": "array",
-                                "items": {
-                                    "type": "string",
-                                    "enum": ["year", "state_province", "collection_name", "family", "order", "class", "genus", "institution"] #"basis_of_record",
-                                },
-                                "description": "Faceted distributions to include"
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_specimen_statistics",
+                "description": "Get statistical summary and distributions for specimens matching search criteria",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "scientific_name": {"type": "string"},
+                        "common_name": {"type": "string"},
+                        "state_province": {"type": "string"},
+                        "year_range": {
+                            "type": "object",
+                            "properties": {
+                                "start_year": {"type": "integer"},
+                                "end_year": {"type": "integer"}
                             }
+                        },
+                        "collection_name": {"type": "string"},
+                        "count_only": {
+                            "type": "boolean",
+                            "description": "True when the user only asks for numbers - how many specimens match, optionally broken down by include_facets - so the counts are reported directly without a follow-up summary"
+                        },
+                        "include_facets": {
+                            "type": "array",
+                            "items": {
+                                "type": "string",
+                                "enum": ["year", "state_province", "collection_name", "family", "order", "class", "genus", "institution"] #"basis_of_record",
+                            },
+                            "description": "Faceted distributions to include"
                         }
                     }
                 }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_specimen_by_id",
-                    "description": "Retrieve detailed information for a specific specimen by catalog number or UUID",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "specimen_id": {"type": "string"}
-                        },
-                        "required": ["specimen_id"]
-                    }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_specimen_by_id",
+                "description": "Retrieve detailed information for a specific specimen by catalog number or UUID",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "specimen_id": {"type": "string"}
+                    },
+                    "required": ["specimen_id"]
                 }
             }
-        ]
+        }
+    )
 
-    def get_or_create_session(self, session_id: str) -> List[Dict]:
-        """Get existing session or create new one"""
-        if session_id not in self.conversations:
-            self.conversations[session_id] = [
-                {"role": "system", "content": self.system_prompt}
-            ]
-        return self.conversations[session_id]
+    # Projection used to format search results. BiocacheService._process_occurrence
+    # always sets every one of these keys, so a single C-level itemgetter call
+    # replaces ~25 occ.get() lookups per specimen.
+    _SPECIMEN_FIELDS = operator.itemgetter(
+        'scientificName', 'commonName', 'catalogNumber', 'id', 'collectionName',
+        'institutionName', 'stateProvince', 'locality', 'latitude', 'longitude',
+        'coordinateUncertaintyInMeters', 'eventDate', 'year', 'month', 'day',
+        'recordedBy', 'identifiedBy',
+        'kingdom', 'phylum', 'class', 'order', 'family', 'genus', 'species'
+    )
+
+    # Flat column names for compact results, one per _SPECIMEN_FIELDS entry plus images
+    _SPECIMEN_COLUMNS = (
+        'scientific_name', 'common_name', 'catalog_number', 'uuid', 'collection_name',
+        'institution', 'state', 'locality', 'latitude', 'longitude',
+        'coordinate_uncertainty_meters', 'event_date', 'year', 'month', 'day',
+        'recorded_by', 'identified_by',
+        'kingdom', 'phylum', 'class', 'order', 'family', 'genus', 'species',
+        'images'
+    )
+
+    # Image extractor per image_quality, chosen once per search instead of branching per
+    # specimen. itemgetter is safe because BiocacheService._process_occurrence always sets
+    # all three URL keys and images (possibly to None).
+    _IMAGE_SELECTORS = MappingProxyType({
+        'thumbnail': operator.itemgetter('thumbnailUrl'),
+        'medium': operator.itemgetter('imageUrl'),
+        'large': operator.itemgetter('largeImageUrl'),
+        'all': _all_images
+    })
+    _NO_IMAGE = staticmethod(lambda occ: None)
+
+    # Stands in for base64 images from earlier turns once they've been answered
+    _IMAGE_PLACEHOLDER = "[image previously provided, identification already completed]"
+
+    # Facets get_specimen_statistics may request. The tool names match the keys
+    # BiocacheService._process_facets produces, so no name mapping is needed.
+    _FACET_NAMES = frozenset({
+        'year', 'state_province', 'collection_name', 'family',
+        'order', 'class', 'genus', 'institution'
+    })
+
+    # Higher taxonomy ranks the tools accept directly (class='Aves', order='Squamata', ...)
+    _TAXON_RANKS = (
+        'kingdom', 'phylum', 'class', 'order', 'family', 'genus',
+        'infraclass', 'subphylum', 'subclass'
+    )
+
+    # Tool arguments copied straight into biocache filters (argument -> filter key).
+    # Names and year_range are handled in _build_filters; has_image and locality in _search_specimens.
+    _KWARG_TO_FILTER = MappingProxyType({
+        **{rank: rank for rank in _TAXON_RANKS},
+        'state_province': 'state_province',
+        'year': 'year',
+        'month': 'month',
+        'catalog_number': 'catalog_number',
+        'recorded_by': 'recorded_by',
+        'identified_by': 'identified_by',
+        'collection_name': 'collection_name',
+        'institution': 'institution',
+        'free_text': 'free_text_search',
+    })
+
+    # The subset of those get_specimen_statistics accepts (all copied under their own name)
+    _STATISTICS_KWARG_TO_FILTER = MappingProxyType({
+        key: key for key in _TAXON_RANKS + ('state_province', 'collection_name')
+    })
+
+
+    # Message roles get_session_history returns to the UI
+    _DISPLAY_ROLES = frozenset({"user", "assistant"})
+
+    # Follow-up prompts shown under each reply (tuples - jsonify renders them as lists)
+    _SUGGESTIONS_IMAGE = (
+        "Search for this species in our collection",
+        "Where has this species been found?",
+        "Show me more specimens with images"
+    )
+    _SUGGESTIONS_NO_IMAGE = (
+        "Show me specimens from a specific collector",
+        "What's the distribution by state?",
+        "Find specimens from a specific year range"
+    )
+    _SUGGESTIONS_DEFAULT = (
+        "Show me kangaroo specimens from NSW",
+        "How many fish specimens are in the collection?",
+        "What species were collected in the 1980s?"
+    )
+
+    # OpenAI request bounds - the client retries transient errors with jittered exponential backoff
+    _OPENAI_TIMEOUT = 60.0
+    _OPENAI_CONNECT_TIMEOUT = 5.0
+    _OPENAI_MAX_RETRIES = 3
+
+    # Longest a call waits on another thread's in-flight Biocache search - above the
+    # 60-second request timeout, so it only trips if the owning request never finishes
+    _SHARED_SEARCH_WAIT = 90.0
 
-    def _trim_conversation_history(self, conversation: List[Dict]) -> List[Dict]:
+    # How long a search may run before a cold fallback name is looked up alongside it
+    _FALLBACK_LOOKUP_DELAY = 0.5
+
+    # Longest a double-submitted message waits for the identical turn already running
+    _DUPLICATE_TURN_WAIT = 180.0
+
+    def __init__(self, biocache_service: Optional[BiocacheService] = None):
         """
-        Trim conversation history while preserving tool_calls/tool/assistant sequences
+        Initialize the chatbot with OpenAI client and backend services.
+        Pass the app's BiocacheService to share its ALA connection pool.
         """
-        if len(conversation) <= self.max_history_length:
-            return conversation
+        # Bound a stalled OpenAI call to a minute instead of the library's 10-minute default
+        self.client = OpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            timeout=httpx.Timeout(self._OPENAI_TIMEOUT, connect=self._OPENAI_CONNECT_TIMEOUT),
+            max_retries=self._OPENAI_MAX_RETRIES
+        )
+        self.biocache_service = biocache_service or BiocacheService()
+        self.response_cleaner = ResponseCleaner()
+        self.geocoding_service = GeocodingService()  # NEW: Add geocoding service
         
-        # Always keep system prompt
-        trimmed = [conversation[0]]
+        # Shared pool for running a turn's tool calls concurrently
+        self.tool_executor = ThreadPoolExecutor(max_workers=8)
+        # Separate pool for I/O started from inside tool calls (BIE lookups, per-location
+        # searches) - submitting to tool_executor could deadlock once every tool thread is waiting
+        self._io_executor = ThreadPoolExecutor(max_workers=8)
         
-        # Get messages to consider (everything except system prompt)
-        messages = conversation[1:]
+        self.model = "gpt-5-mini"
+        self.max_sessions = 1000
+        # Abandoned sessions are dropped after an hour - _save_session re-stores the
+        # history every turn, so the clock restarts whenever a session is used
+        self.session_idle_ttl = 3600
+        self.conversations = _SessionCache(self.max_sessions, self.session_idle_ttl)  # session_id -> deque of messages
+        self.max_history_length = 20
+        # Gunicorn runs threaded workers, so guard the session map's LRU bookkeeping
+        self._sessions_lock = threading.Lock()
         
-        # Work backwards to find safe cutoff point
-        keep_from_index = len(messages) - (self.max_history_length - 1)
+        # Optional Redis session store (REDIS_URL) so every gunicorn worker sees the
+        # same conversations. Redis holds the source of truth, so there is no
+        # in-process copy that could go stale when a session moves between workers.
+        self.redis = None
+        self.session_ttl = 86400
+        if Config.REDIS_URL:
+            self.redis = redis.Redis.from_url(Config.REDIS_URL)
         
-        # Scan backwards from cutoff to find a safe boundary
-        # Safe boundary = right after an assistant message (not tool_calls)
-        for i in range(keep_from_index, -1, -1):
-            msg = messages[i]
-            
-            # Safe to cut after a complete assistant response (no tool_calls)
-            if msg.get('role') == 'assistant' and not msg.get('tool_calls'):
-                trimmed.extend(messages[i+1:])
-                print(f"[ChatbotService] Trimmed conversation from index {i+1}, keeping {len(trimmed)} messages")
-                return trimmed
-            
-            # Also safe to cut after a user message (start of a turn)
-            if msg.get('role') == 'user' and i > 0:
-                # Check if previous message is a complete assistant response
-                prev = messages[i-1]
-                if prev.get('role') == 'assistant' and not prev.get('tool_calls'):
-                    trimmed.extend(messages[i:])
-                    print(f"[ChatbotService] Trimmed conversation from index {i}, keeping {len(trimmed)} messages")
-                    return trimmed
-        
-        # Fallback: keep everything (don't risk breaking structure)
-        print(f"[ChatbotService] WARNING: Could not find safe trim point, keeping all messages")
-        return conversation
+        # ALA BIE name lookups are effectively static, so cache them across sessions
+        self._scientific_name_cache = TTLCache(maxsize=4096, ttl=7 * 86400)
+        self._vernacular_name_cache = TTLCache(maxsize=4096, ttl=7 * 86400)
+        # Names BIE had no match for, keyed by (kind, name) - shorter TTL in case BIE gains them
+        self._name_miss_cache = TTLCache(maxsize=4096, ttl=3600)
+        # Lookups currently running, keyed by (kind, name), so concurrent tool calls
+        # resolving the same name wait for one BIE request instead of each sending one
+        self._name_lookups_in_flight: Dict[Tuple[str, str], Future] = {}
+        self._name_cache_lock = threading.Lock()
+        
+        # Found names also persist in SQLite so restarts and other gunicorn workers
+        # don't re-query BIE (NAME_CACHE_DB='' keeps them in memory only)
+        self._name_db = None
+        self._name_db_lock = threading.Lock()
+        if Config.NAME_CACHE_DB:
+            self._name_db = sqlite3.connect(Config.NAME_CACHE_DB, check_same_thread=False)
+            self._name_db.execute("PRAGMA journal_mode=WAL")
+            self._name_db.execute(
+                "CREATE TABLE IF NOT EXISTS names "
+                "(kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (kind, key))"
+            )
+            self._name_db.commit()
+            # Load the most recently stored names into memory off the startup path,
+            # so the first turns after a restart skip the SQLite lookup as well as BIE
+            self._io_executor.submit(self._prewarm_name_caches)
+        
+        # Recent search_specimens results keyed by canonical arguments - ALA data
+        # changes slowly, so a few minutes of reuse is safe
+        self._search_cache = TTLCache(maxsize=1024, ttl=300)
+        self._search_cache_lock = threading.Lock()
+        
+        # Plain (non-spatial) Biocache searches currently running, keyed by canonical
+        # filters -> (page_size, Future). Every search returns totalRecords and facets, so
+        # a statistics call for the same filters - typically issued alongside
+        # search_specimens in one turn - waits on that request instead of sending its own
+        self._filter_searches_in_flight: Dict[bytes, Tuple[int, Future]] = {}
+        self._filter_searches_lock = threading.Lock()
+        
+        # Accidental double submits are answered without re-running the model: a resend
+        # that arrives while the identical turn is still running waits on it
+        # (session_id -> (turn key, Future of the payload)), and one that arrives just
+        # after gets the stored response (session_id -> (turn key, payload)). The window
+        # is only a few seconds - a deliberate resend ("try again") gets a fresh answer.
+        self._turns_in_flight: Dict[str, Tuple[str, Future]] = {}
+        self._last_answers = TTLCache(maxsize=self.max_sessions, ttl=5)
+        self._turns_lock = threading.Lock()
+        
+    def get_or_create_session(self, session_id: str) -> Deque[Message]:
+        """
+        Get existing session history or create a new one, evicting the least
+        recently used session when full (idle sessions expire on their own).
+        History excludes the system message.
+        """
+        if self.redis is not None:
+            return deque(self._load_redis_history(session_id))
+        
+        with self._sessions_lock:
+            history = self.conversations.get(session_id)
+            if history is None:
+                history = self.conversations[session_id] = deque()
+            return history
+
+    def _peek_session(self, session_id: str) -> Optional[Deque[Message]]:
+        """Session history if the session exists, without creating it"""
+        if self.redis is not None:
+            return deque(self._load_redis_history(session_id))
+        
+        with self._sessions_lock:
+            return self.conversations.get(session_id)
+
+    @staticmethod
+    def _redis_key(session_id: str) -> str:
+        return f"chat:{session_id}"
+
+    def _load_redis_history(self, session_id: str) -> List[Message]:
+        """Messages stored in Redis for a session (the shared system message is not stored)"""
+        raw = self.redis.get(self._redis_key(session_id))
+        return [Message.from_openai(msg) for msg in orjson.loads(raw)] if raw else []
+
+    def _save_session(self, session_id: str, history: Deque[Message]) -> None:
+        """Store a session's (already trimmed) history"""
+        if self.redis is not None:
+            self.redis.set(
+                self._redis_key(session_id),
+                orjson.dumps([msg.to_openai() for msg in history]),
+                ex=self.session_ttl
+            )
+            return
+        
+        with self._sessions_lock:
+            self.conversations[session_id] = history
+
+    def _messages_for_model(self, history: Deque[Message]) -> List[Dict]:
+        """System message followed by the session history, as sent to OpenAI"""
+        return [self._SYSTEM_MESSAGE, *(msg.to_openai() for msg in history)]
+
+    def _strip_old_images(self, history: Deque[Message], current_message: Message) -> None:
+        """
+        Replace base64 image payloads in earlier user turns with a short text
+        placeholder, so they aren't re-sent to the model on every later turn
+        and per-session memory stays bounded. Every turn strips the ones before
+        it, so only the most recent earlier user turn can still carry images
+        """
+        for msg in reversed(history):
+            if msg is current_message or msg.role != 'user':
+                continue
+            content = msg.content
+            if isinstance(content, list) and any(part.get('type') == 'image_url' for part in content):
+                msg.content = [
+                    {"type": "text", "text": self._IMAGE_PLACEHOLDER} if part.get('type') == 'image_url' else part
+                    for part in content
+                ]
+            break
+
+    def _trim_conversation_history(self, history: Deque[Message]) -> None:
+        """
+        Trim conversation history in place while preserving tool_calls/tool/assistant sequences.
+        Histories are plain deques: deque(maxlen=...) would evict one message at a time on
+        append and could orphan tool results from their tool_calls message, so eviction
+        happens here instead, with O(1) poplefts up to the next turn boundary.
+        """
+        # Leave room for the system message, which isn't stored in the history
+        max_messages = self.max_history_length - 1
+        if len(history) <= max_messages:
+            return
+        
+        dropped = 0
+        while len(history) > max_messages:
+            history.popleft()
+            dropped += 1
+        
+        # A user message always starts a turn, so cutting right before one never
+        # separates an assistant tool_calls message from its tool results. The
+        # current turn's user message is always present, so this stops there at the latest.
+        while history[0].role != 'user':
+            history.popleft()
+            dropped += 1
+        
+        logger.debug("Trimmed %d messages, keeping %d messages", dropped, len(history))
 
     def _is_generic_animal_term(self, term: str) -> bool:
         """Check if the term is a generic animal category that needs special handling"""
-        return term.lower().strip() in self.GENERIC_ANIMAL_TERMS
+        # Tool arguments are usually already lower-case - try the raw string first
+        return term in GENERIC_ANIMAL_TERMS or _normalize_name(term) in GENERIC_ANIMAL_TERMS
 
     def _get_taxonomy_for_generic_term(self, term: str) -> Optional[Dict]:
         """
         Get the correct taxonomic rank and value for a generic animal term.
         Returns dict with 'rank' and 'value' keys, or None if not a generic term.
         """
-        term_lower = term.lower().strip()
-        if term_lower in self.GENERIC_ANIMAL_TERMS:
-            mapping = self.GENERIC_ANIMAL_TERMS[term_lower]
-            print(f"[ChatbotService] ✓ Found generic term '{term}' -> {mapping['rank']}:{mapping['value']}")
+        # Tool arguments are usually already lower-case - try the raw string first
+        mapping = GENERIC_ANIMAL_TERMS.get(term) or GENERIC_ANIMAL_TERMS.get(_normalize_name(term))
+        if mapping:
+            logger.debug("Found generic term '%s' -> %s:%s", term, mapping['rank'], mapping['value'])
             return mapping
         return None
 
     def execute_function(self, function_name: str, arguments: Dict) -> Dict:
         """Execute function with fallback logic for name conversion (RULE 3)"""
-        print(f"[ChatbotService] execute_function called: {function_name}")
-        print(f"[ChatbotService] Raw arguments from OpenAI: {arguments}")
-        sys.stdout.flush()
+        logger.debug("execute_function called: %s", function_name)
+        logger.debug("Raw arguments from OpenAI: %s", arguments)
         
         if function_name == "search_specimens":
-            return self._search_specimens_with_fallback(**arguments)
+            return self._search_specimens_cached(arguments)
         elif function_name == "get_specimen_statistics":
             return self._get_specimen_statistics_with_fallback(**arguments)
         elif function_name == "get_specimen_by_id":
@@ -475,6 +830,24 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
         else:
             raise ValueError(f"Unknown function: {function_name}")
 
+    def _search_specimens_cached(self, arguments: Dict) -> Dict:
+        """
+        Serve identical search_specimens calls (from any session) from a short-lived
+        cache, so repeat questions skip the biocache/BIE round trips
+        """
+        # Canonical key: sorted keys, so argument order from the model doesn't matter
+        key = orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS)
+        with self._search_cache_lock:
+            cached = self._search_cache.get(key)
+        if cached is not None:
+            logger.debug("Search cache hit for %s", arguments)
+            return cached
+        
+        results = self._search_specimens_with_fallback(**arguments)
+        with self._search_cache_lock:
+            self._search_cache[key] = results
+        return results
+
     def _search_specimens_with_fallback(self, **kwargs) -> Dict:
         """
         Search with intelligent fallback:
@@ -482,46 +855,36 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
            use the predefined taxonomy mapping to search by class/order.
         2. Otherwise, use regular vernacular name search with fallback to scientific name.
         """
-        print(f"[ChatbotService] _search_specimens_with_fallback called with kwargs: {kwargs}")
-        sys.stdout.flush()
-        
         # DEFENSIVE: If both scientific_name and common_name are provided, remove common_name
-        if kwargs.get('scientific_name') and kwargs.get('common_name'):
-            print(f"[ChatbotService] WARNING: Both scientific_name and common_name provided! Removing common_name to enforce Rule 4.")
-            kwargs = kwargs.copy()
-            del kwargs['common_name']
+        # (rare, so only pay for the value checks when both keys are present).
+        # kwargs is already a fresh dict built by the ** call, so no copy is needed.
+        if 'scientific_name' in kwargs and 'common_name' in kwargs:
+            if kwargs['scientific_name'] and kwargs['common_name']:
+                logger.warning("Both scientific_name and common_name provided! Removing common_name to enforce Rule 4.")
+                del kwargs['common_name']
         
         # =============================================================
         # STEP 1: Check if common_name is a GENERIC ANIMAL TERM
         # =============================================================
-        if kwargs.get('common_name'):
-            common_name = kwargs['common_name']
+        common_name = kwargs.get('common_name')
+        if common_name:
             taxonomy_mapping = self._get_taxonomy_for_generic_term(common_name)
             
             if taxonomy_mapping:
                 # This is a generic term like "bird", "snake", "fish"
                 # Use the predefined taxonomy mapping instead of ALA BIE lookup
-                print(f"[ChatbotService] '{common_name}' is a GENERIC ANIMAL TERM")
-                print(f"[ChatbotService] Using predefined taxonomy: {taxonomy_mapping['rank']}={taxonomy_mapping['value']}")
-                
-                # Build search with taxonomic filter instead of vernacular name
-                kwargs_copy = kwargs.copy()
-                del kwargs_copy['common_name']  # Remove the generic term
+                # (_get_taxonomy_for_generic_term already logged the match)
+                rank, value = taxonomy_mapping['rank'], taxonomy_mapping['value']
                 
-                # Add the correct taxonomic filter
-                rank = taxonomy_mapping['rank']
-                value = taxonomy_mapping['value']
-                kwargs_copy[rank] = value  # e.g., kwargs_copy['class'] = 'Aves'
-                
-                # Perform the search
-                results = self._search_specimens(**kwargs_copy)
+                # Perform the search, e.g. with class='Aves' instead of common_name='bird'
+                results = self._search_specimens(**self._swap_name(kwargs, 'common_name', rank, value))
                 
                 if results['total_records'] > 0:
-                    print(f"[ChatbotService] ✓ Generic term search successful! Found {results['total_records']} records")
+                    logger.debug("Generic term search successful! Found %s records", results['total_records'])
                     results['search_note'] = f"Searched for all {common_name}s using {rank}='{value}'"
                     return results
                 else:
-                    print(f"[ChatbotService] Generic term search returned 0 results")
+                    logger.debug("Generic term search returned 0 results")
                     # Still return empty results with the note
                     results['search_note'] = f"No {common_name} specimens found in this location"
                     return results
@@ -529,7 +892,14 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
         # =============================================================
         # STEP 2: Regular search for non-generic terms
         # =============================================================
-        original_results = self._search_specimens(**kwargs)
+        # A slow search gets its fallback name resolved alongside it, so an empty
+        # result doesn't then wait on a second round trip
+        primary_done = threading.Event()
+        self._speculate_fallback_name(kwargs, primary_done)
+        try:
+            original_results = self._search_specimens(**kwargs)
+        finally:
+            primary_done.set()
         
         # If we got results, return them
         if original_results['total_records'] > 0:
@@ -538,167 +908,316 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
         # =============================================================
         # STEP 3: Fallback logic for specific species names
         # =============================================================
-        print("[ChatbotService] No results with original query, attempting fallback...")
+        logger.debug("No results for %s, attempting fallback...", kwargs)
         
         # Case 1: User searched with vernacular name → try scientific name
-        if kwargs.get('common_name'):
-            common_name = kwargs['common_name']
-            print(f"[ChatbotService] Attempting to find scientific name for: {common_name}")
+        if common_name:
+            logger.debug("Attempting to find scientific name for: %s", common_name)
             
             scientific_name = self._get_scientific_name_for_common(common_name)
             
             if scientific_name:
-                print(f"[ChatbotService] Found scientific name: {scientific_name}, retrying search...")
-                kwargs_copy = kwargs.copy()
-                del kwargs_copy['common_name']
-                kwargs_copy['scientific_name'] = scientific_name
-                
-                fallback_results = self._search_specimens(**kwargs_copy)
+                logger.debug("Found scientific name: %s, retrying search...", scientific_name)
+                fallback_results = self._search_specimens(
+                    **self._swap_name(kwargs, 'common_name', 'scientific_name', scientific_name)
+                )
                 
                 if fallback_results['total_records'] > 0:
-                    print(f"[ChatbotService] ✓ Fallback successful! Found {fallback_results['total_records']} records")
+                    logger.debug("Fallback successful! Found %s records", fallback_results['total_records'])
                     fallback_results['fallback_note'] = f"Searched using scientific name '{scientific_name}' for common name '{common_name}'"
                     return fallback_results
         
         # Case 2: User searched with scientific name → try vernacular name
         elif kwargs.get('scientific_name'):
             scientific_name = kwargs['scientific_name']
-            print(f"[ChatbotService] Attempting to find vernacular name for: {scientific_name}")
+            logger.debug("Attempting to find vernacular name for: %s", scientific_name)
             
             vernacular_name = self._get_vernacular_name_for_scientific(scientific_name)
             
             if vernacular_name:
-                print(f"[ChatbotService] Found vernacular name: {vernacular_name}, retrying search...")
-                kwargs_copy = kwargs.copy()
-                del kwargs_copy['scientific_name']
-                kwargs_copy['common_name'] = vernacular_name
-                
-                fallback_results = self._search_specimens(**kwargs_copy)
+                logger.debug("Found vernacular name: %s, retrying search...", vernacular_name)
+                fallback_results = self._search_specimens(
+                    **self._swap_name(kwargs, 'scientific_name', 'common_name', vernacular_name)
+                )
                 
                 if fallback_results['total_records'] > 0:
-                    print(f"[ChatbotService] ✓ Fallback successful! Found {fallback_results['total_records']} records")
+                    logger.debug("Fallback successful! Found %s records", fallback_results['total_records'])
                     fallback_results['fallback_note'] = f"Searched using vernacular name '{vernacular_name}' for scientific name '{scientific_name}'"
                     return fallback_results
         
-        print("[ChatbotService] Fallback also returned no results")
+        logger.debug("Fallback also returned no results")
         return original_results
 
+    @staticmethod
+    def _swap_name(kwargs: Dict, drop: str, add_key: str, add_value) -> Dict:
+        """
+        Build fallback search kwargs in one pass: everything in kwargs except
+        `drop`, plus add_key=add_value. The caller's kwargs are left untouched.
+        """
+        swapped = {k: v for k, v in kwargs.items() if k != drop}
+        swapped[add_key] = add_value
+        return swapped
+
     def _get_scientific_name_for_common(self, common_name: str) -> Optional[str]:
         """
-        Try to find the scientific name for a common name.
-        Uses ALA's BIE API with proper ANIMALIA kingdom filtering.
+        Try to find the scientific name for a common name (cached per normalised name)
+        """
+        return self._cached_name_lookup(
+            'scientific', self._scientific_name_cache, common_name, self._query_scientific_name_for_common
+        )
+
+    def _get_vernacular_name_for_scientific(self, scientific_name: str) -> Optional[str]:
+        """
+        Try to find the vernacular/common name for a scientific name (cached per normalised name)
+        """
+        return self._cached_name_lookup(
+            'vernacular', self._vernacular_name_cache, scientific_name, self._query_vernacular_name_for_scientific
+        )
+
+    def _speculate_fallback_name(self, kwargs: Dict, primary_done: threading.Event) -> None:
         """
+        Warm the fallback name (common -> scientific, or scientific -> common) in case
+        the primary query comes back empty. Names already in the name or miss caches
+        cost nothing later, so nothing is started for them. A cold name only goes to
+        BIE if the primary query is still running after _FALLBACK_LOOKUP_DELAY, so
+        fast queries never pay for a lookup they don't use. The fallback path calls
+        the same lookup afterwards, joining this one if it is still running.
+        """
+        if kwargs.get('common_name'):
+            kind, cache, name = 'scientific', self._scientific_name_cache, kwargs['common_name']
+            lookup = self._get_scientific_name_for_common
+        elif kwargs.get('scientific_name'):
+            kind, cache, name = 'vernacular', self._vernacular_name_cache, kwargs['scientific_name']
+            lookup = self._get_vernacular_name_for_scientific
+        else:
+            return
+        
+        key = _normalize_name(name)
+        with self._name_cache_lock:
+            if key in cache or (kind, key) in self._name_miss_cache:
+                return
+        
+        def lookup_if_slow():
+            if not primary_done.wait(self._FALLBACK_LOOKUP_DELAY):
+                lookup(name)
+        
+        self._io_executor.submit(lookup_if_slow)
+
+    def _cached_name_lookup(self, kind: str, cache, name: str, lookup) -> Optional[str]:
+        """
+        Serve a BIE name lookup from cache, querying ALA only on a miss.
+        The in-memory cache sits in front of the SQLite name store; names BIE
+        has no match for are remembered for a shorter time in _name_miss_cache
+        (memory only) so misspellings don't hit ALA on every turn. Request
+        errors are not cached at all so transient failures can recover.
+        Concurrent misses for the same name share the first caller's lookup.
+        """
+        key = _normalize_name(name)
+        miss_key = (kind, key)
+        with self._name_cache_lock:
+            cached = cache.get(key)
+            known_miss = miss_key in self._name_miss_cache
+            in_flight = None
+            if cached is None and not known_miss:
+                in_flight = self._name_lookups_in_flight.get(miss_key)
+                if in_flight is None:
+                    self._name_lookups_in_flight[miss_key] = owned = Future()
+        if cached is not None:
+            logger.debug("Name cache hit for '%s': %s", key, cached)
+            return cached
+        if known_miss:
+            logger.debug("Name cache hit for '%s': no match", key)
+            return None
+        if in_flight is not None:
+            logger.debug("Waiting for in-flight lookup of '%s'", key)
+            return in_flight.result()
+        
+        value = None
         try:
-            import requests
+            value = self._resolve_uncached_name(kind, cache, key, name, lookup)
+        finally:
+            with self._name_cache_lock:
+                del self._name_lookups_in_flight[miss_key]
+            owned.set_result(value)
+        return value
+
+    def _resolve_uncached_name(self, kind: str, cache, key: str, name: str, lookup) -> Optional[str]:
+        """The SQLite-then-ALA half of _cached_name_lookup, storing whatever it finds"""
+        value = self._load_persisted_name(kind, key)
+        if value is not None:
+            logger.debug("Name store hit for '%s': %s", key, value)
+            with self._name_cache_lock:
+                cache[key] = value
+            return value
+        
+        try:
+            value = lookup(name)
+        except Exception as e:
+            logger.exception("Error in ALA species lookup: %s", e)
+            return None
+        
+        with self._name_cache_lock:
+            if value is not None:
+                cache[key] = value
+            else:
+                self._name_miss_cache[(kind, key)] = True
+        if value is not None:
+            self._persist_name(kind, key, value)
+        return value
+
+    def _prewarm_name_caches(self) -> None:
+        """Fill the in-memory name caches from the SQLite name store, newest names first"""
+        for kind, cache in (
+            ('scientific', self._scientific_name_cache),
+            ('vernacular', self._vernacular_name_cache)
+        ):
+            try:
+                with self._name_db_lock:
+                    rows = self._name_db.execute(
+                        "SELECT key, value FROM names WHERE kind = ? ORDER BY rowid DESC LIMIT ?",
+                        (kind, cache.maxsize)
+                    ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning("Name store prewarm failed: %s", e)
+                return
             
-            url = "https://bie.ala.org.au/ws/search"
-            params = {
-                'q': common_name,
-                'fq': 'idxtype:TAXON',
-                'pageSize': 10  # Get more results for better filtering
-            }
+            # Oldest first, so the newest names end up most recently used; entries a
+            # request has already cached meanwhile are left alone
+            with self._name_cache_lock:
+                for key, value in reversed(rows):
+                    if key not in cache:
+                        cache[key] = value
+            logger.debug("Prewarmed %d %s names from the name store", len(rows), kind)
+
+    def _load_persisted_name(self, kind: str, key: str) -> Optional[str]:
+        """Look a normalised name up in the SQLite name store, or None"""
+        if self._name_db is None:
+            return None
+        try:
+            with self._name_db_lock:
+                row = self._name_db.execute(
+                    "SELECT value FROM names WHERE kind = ? AND key = ?", (kind, key)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Name store read failed: %s", e)
+            return None
+        return row[0] if row else None
+
+    def _persist_name(self, kind: str, key: str, value: str) -> None:
+        """Record a resolved name in the SQLite name store (best effort)"""
+        if self._name_db is None:
+            return
+        try:
+            with self._name_db_lock:
+                self._name_db.execute(
+                    "INSERT OR REPLACE INTO names (kind, key, value) VALUES (?, ?, ?)", (kind, key, value)
+                )
+                self._name_db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Name store write failed: %s", e)
+
+    def _query_scientific_name_for_common(self, common_name: str) -> Optional[str]:
+        """
+        Query ALA's BIE API for the scientific name of a common name,
+        with proper ANIMALIA kingdom filtering. Raises on request errors.
+        """
+        params = {
+            'q': common_name,
+            'fq': _BIE_ANIMAL_TAXON_FQ,
+            'pageSize': 1  # BIE already drops non-animal matches, so the top hit is the answer
+        }
+        
+        logger.debug("Querying ALA BIE for: '%s'", common_name)
+        response = _BIE_SESSION.get(BIE_SEARCH_URL, params=params, timeout=10)
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        results = data.get('searchResults', {}).get('results', [])
+        
+        if results:
+            result = results[0]
+            logger.debug("ALA BIE found ANIMALIA result: %s", result.get('name'))
             
-            print(f"[ChatbotService] Querying ALA BIE for: '{common_name}'")
-            response = requests.get(url, params=params, timeout=10)
+            scientific_name = result.get('scientificName') or result.get('name')
+            if not scientific_name or ' ' not in scientific_name:
+                scientific_name = result.get('acceptedConceptName') or scientific_name
             
-            if response.status_code == 200:
-                data = response.json()
-                results = data.get('searchResults', {}).get('results', [])
-                
-                if results:
-                    # Filter for ANIMALIA kingdom only
-                    animal_results = [r for r in results if r.get('kingdom') == 'ANIMALIA']
-                    
-                    if animal_results:
-                        result = animal_results[0]
-                        print(f"[ChatbotService] ALA BIE found ANIMALIA result: {result.get('name')}")
-                        
-                        scientific_name = result.get('scientificName') or result.get('name')
-                        if not scientific_name or ' ' not in scientific_name:
-                            scientific_name = result.get('acceptedConceptName') or scientific_name
-                        
-                        if scientific_name:
-                            print(f"[ChatbotService] ALA lookup found scientific name: '{scientific_name}'")
-                            return scientific_name
-                    else:
-                        print(f"[ChatbotService] No ANIMALIA results found for '{common_name}'")
-                        
-        except Exception as e:
-            print(f"[ChatbotService] Error in ALA species lookup: {e}")
-            import traceback
-            traceback.print_exc()
+            if scientific_name:
+                logger.debug("ALA lookup found scientific name: '%s'", scientific_name)
+                return scientific_name
+        else:
+            logger.debug("No ANIMALIA results found for '%s'", common_name)
         
         return None
 
-    def _get_vernacular_name_for_scientific(self, scientific_name: str) -> Optional[str]:
+    def _query_vernacular_name_for_scientific(self, scientific_name: str) -> Optional[str]:
         """
-        Try to find the vernacular/common name for a scientific name
+        Query ALA's BIE API for the vernacular/common name of a scientific name.
+        Raises on request errors.
         """
-        try:
-            import requests
-            
-            url = "https://bie.ala.org.au/ws/search"
-            params = {
-                'q': scientific_name,
-                'fq': 'idxtype:TAXON',
-                'pageSize': 1
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                results = data.get('searchResults', {}).get('results', [])
-                
-                if results:
-                    vernacular_name = results[0].get('commonName') or results[0].get('vernacularName')
-                    if vernacular_name:
-                        print(f"[ChatbotService] ALA lookup found: {vernacular_name}")
-                        return vernacular_name
-        except Exception as e:
-            print(f"[ChatbotService] Error in ALA species lookup: {e}")
+        params = {
+            'q': scientific_name,
+            'fq': 'idxtype:TAXON',
+            'pageSize': 1
+        }
+        
+        response = _BIE_SESSION.get(BIE_SEARCH_URL, params=params, timeout=10)
+        response.raise_for_status()
+        
+        data = orjson.loads(response.content)
+        results = data.get('searchResults', {}).get('results', [])
+        
+        if results:
+            vernacular_name = results[0].get('commonName') or results[0].get('vernacularName')
+            if vernacular_name:
+                logger.debug("ALA lookup found: %s", vernacular_name)
+                return vernacular_name
         
         return None
 
+    @staticmethod
+    def _build_filters(kwargs: Dict, kwarg_to_filter) -> Dict:
+        """
+        Biocache filters shared by search and statistics: the straight copies in
+        kwarg_to_filter, one name filter (scientific_name wins over common_name)
+        and year_range as a Solr range
+        """
+        # Straight copies: higher taxonomy, state, dates, specimen details, free text
+        filters = {
+            name: kwargs[key]
+            for key, name in kwarg_to_filter.items()
+            if kwargs.get(key)
+        }
+        
+        # Handle scientific_name (species, genus, family), else common_name (vernacular)
+        if kwargs.get('scientific_name'):
+            filters['scientific_name'] = kwargs['scientific_name']
+        elif kwargs.get('common_name'):
+            filters['common_name'] = kwargs['common_name']
+        
+        if kwargs.get('year_range'):
+            yr = kwargs['year_range']
+            filters['year_range'] = f"[{yr['start_year']} TO {yr['end_year']}]"
+        
+        return filters
+
     def _search_specimens(self, **kwargs) -> Dict:
         """Execute specimen search - handles both regular filters and taxonomic rank filters"""
-        import os
-        log_path = os.path.join(os.getcwd(), 'chatbot_debug.log')
-        with open(log_path, 'a') as f:
-            f.write(f"\n=== _search_specimens CALLED ===\n")
-            f.write(f"kwargs: {kwargs}\n")
-            f.flush()
+        logger.debug("_search_specimens called with kwargs=%s", kwargs)
         
-        print(f"[ChatbotService] _search_specimens called with: {kwargs}")
-        sys.stdout.flush()
-        
-        filters = {}
         lat = None
         lon = None
         radius = None
         
-        # =============================================================
-        # TAXONOMIC FILTERS
-        # =============================================================
-        # Handle scientific_name (species, genus, family)
-        if kwargs.get('scientific_name'):
-            filters['scientific_name'] = kwargs['scientific_name']
-        # Handle common_name (vernacular)
-        elif kwargs.get('common_name'):
-            filters['common_name'] = kwargs['common_name']
+        filters = self._build_filters(kwargs, self._KWARG_TO_FILTER)
         
-        # Handle higher taxonomy filters (from generic term mapping)
-        # These are passed directly as kwargs like class='Aves' or order='Squamata'
-        for rank in ['kingdom', 'phylum', 'class', 'order', 'family', 'genus', 'infraclass', 'subphylum', 'subclass']:
-            if kwargs.get(rank):
-                filters[rank] = kwargs[rank]
-                print(f"[ChatbotService] Added taxonomic filter: {rank}={kwargs[rank]}")
+        # Images
+        if kwargs.get('has_image') is not None:
+            filters['has_image'] = kwargs['has_image']
         
         # =============================================================
         # GEOGRAPHIC FILTERS
         # =============================================================
-        if kwargs.get('state_province'):
-            filters['state_province'] = kwargs['state_province']
-        
         # Locality with geocoding
         if kwargs.get('locality'):
             locality = kwargs['locality']
@@ -731,86 +1250,100 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
                         radius = self.geocoding_service.get_search_radius_km(geocoded['place_type'])
                         
                         if 'state_province' in filters:
-                            print(f"[ChatbotService] Removing state filter to use spatial search only")
+                            logger.debug("Removing state filter to use spatial search only")
                             del filters['state_province']
                 
                 elif len(geocoded_list) > 1:
-                    print(f"[ChatbotService] Found {len(geocoded_list)} locations, searching all")
+                    logger.debug("Found %d locations, searching all", len(geocoded_list))
                     
                     limit = min(kwargs.get('limit', 10), 100)
-                    all_occurrences = []
-                    total_sum = 0
+                    partial_total = False
                     
-                    for location in geocoded_list:
-                        loc_filters = filters.copy()
-                        loc_filters['state_province'] = location.get('state')
+                    areas = [
+                        {
+                            'state': location.get('state'),
+                            'latitude': location['latitude'],
+                            'longitude': location['longitude'],
+                            'radius': self.geocoding_service.get_search_radius_km(location['place_type'])
+                        }
+                        for location in geocoded_list
+                    ]
+                    
+                    # All locations in one ALA request when the backend accepts the combined query
+                    try:
+                        bulk_results = self.biocache_service.search_occurrences_bulk(filters, areas, page_size=limit)
+                    except requests.HTTPError as e:
+                        logger.warning("Bulk location search rejected (%s), searching locations individually", e)
+                        bulk_results = None
+                    
+                    # An accepted query can still come back empty or outside every requested
+                    # state if ALA ignores the combined spatial filter - trust the fan-out then
+                    if bulk_results is not None and not self._bulk_matches_areas(bulk_results, areas):
+                        logger.warning("Bulk location search returned no rows for the requested areas, searching locations individually")
+                        bulk_results = None
+                    
+                    if bulk_results is not None:
+                        # One Solr result set lists each occurrence once - nothing to de-duplicate
+                        total_sum = bulk_results.get('totalRecords', 0)
+                        unique = bulk_results.get('occurrences', [])[:limit]
+                    else:
+                        seen_uuids = set()
+                        unique = []
+                        total_sum = 0
                         
-                        loc_results = self.biocache_service.search_occurrences(
-                            filters=loc_filters,
-                            page=0,
-                            page_size=limit,
-                            lat=location['latitude'],
-                            lon=location['longitude'],
-                            radius=self.geocoding_service.get_search_radius_km(location['place_type'])
-                        )
+                        def search_area(area):
+                            loc_filters = filters.copy()
+                            loc_filters['state_province'] = area['state']
+                            
+                            return self.biocache_service.search_occurrences(
+                                filters=loc_filters,
+                                page=0,
+                                page_size=limit,
+                                lat=area['latitude'],
+                                lon=area['longitude'],
+                                radius=area['radius']
+                            )
                         
-                        all_occurrences.extend(loc_results.get('occurrences', []))
-                        total_sum += loc_results.get('totalRecords', 0)
-                    
-                    # Remove duplicates by UUID
-                    seen = set()
-                    unique = []
-                    for occ in all_occurrences:
-                        uuid = occ.get('id')
-                        if uuid and uuid not in seen:
-                            seen.add(uuid)
-                            unique.append(occ)
+                        # Each location is an independent ALA request - run them concurrently.
+                        # Results are consumed in geocoder order, so de-duplication stays deterministic.
+                        futures = [self._io_executor.submit(search_area, area) for area in areas]
+                        for i, future in enumerate(futures):
+                            if len(unique) >= limit:
+                                # Enough specimens already - drop the locations we haven't used yet
+                                for pending in futures[i:]:
+                                    pending.cancel()
+                                partial_total = True
+                                logger.debug("Limit reached, skipped %d of %d locations", len(futures) - i, len(futures))
+                                break
+                            
+                            loc_results = future.result()
+                            total_sum += loc_results.get('totalRecords', 0)
+                            
+                            # Locations can overlap - remove duplicates by UUID, stopping once we have enough
+                            for occ in loc_results.get('occurrences', []):
+                                if len(unique) >= limit:
+                                    break
+                                uuid = occ.get('id')
+                                if uuid and uuid not in seen_uuids:
+                                    seen_uuids.add(uuid)
+                                    unique.append(occ)
                     
                     results = {
                         'totalRecords': total_sum,
-                        'occurrences': unique[:limit],
-                        'ala_url': None
+                        'occurrences': unique,
+                        # No single ALA link covers several point searches - link the same
+                        # filters without the location so the user still has a starting point
+                        'ala_url': self.biocache_service.build_ala_url(
+                            {key: value for key, value in filters.items() if key != 'state_province'}
+                        ),
+                        # totalRecords only covers the locations actually queried
+                        'partial_total': partial_total
                     }
                     
-                    kwargs['_skip_normal_search'] = True
+                    return self._format_search_results(results, kwargs)
             else:
                 filters['locality'] = locality
         
-        # =============================================================
-        # TEMPORAL FILTERS
-        # =============================================================
-        if kwargs.get('year'):
-            filters['year'] = kwargs['year']
-        if kwargs.get('year_range'):
-            yr = kwargs['year_range']
-            filters['year_range'] = f"[{yr['start_year']} TO {yr['end_year']}]"
-        if kwargs.get('month'):
-            filters['month'] = kwargs['month']
-        
-        # =============================================================
-        # SPECIMEN DETAIL FILTERS
-        # =============================================================
-        if kwargs.get('catalog_number'):
-            filters['catalog_number'] = kwargs['catalog_number']
-        if kwargs.get('recorded_by'):
-            filters['recorded_by'] = kwargs['recorded_by']
-        if kwargs.get('identified_by'):
-            filters['identified_by'] = kwargs['identified_by']
-        
-        # Collection filters
-        if kwargs.get('collection_name'):
-            filters['collection_name'] = kwargs['collection_name']
-        if kwargs.get('institution'):
-            filters['institution'] = kwargs['institution']
-        
-        # Images
-        if kwargs.get('has_image') is not None:
-            filters['has_image'] = kwargs['has_image']
-        
-        # Free text
-        if kwargs.get('free_text'):
-            filters['free_text_search'] = kwargs['free_text']
-        
         # Explicit point_radius from user
         if kwargs.get('point_radius'):
             pr = kwargs['point_radius']
@@ -821,14 +1354,16 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
         bounds = kwargs.get('bounds')
         limit = min(kwargs.get('limit', 10), 100)
         
-        print(f"[ChatbotService] About to call search_occurrences with:")
-        print(f"[ChatbotService]   lat={lat}, lon={lon}, radius={radius}")
-        print(f"[ChatbotService]   filters={filters}")
+        logger.debug(
+            "About to call search_occurrences lat=%s lon=%s radius=%s filters=%s",
+            lat, lon, radius, filters
+        )
         
-        # Check if we already did combined search for multiple locations
-        if not kwargs.get('_skip_normal_search'):
+        if bounds is None and lat is None:
+            results = self._shared_filter_search(filters, limit)
+        else:
             results = self.biocache_service.search_occurrences(
-                filters=filters if filters else None,
+                filters=filters,
                 page=0,
                 page_size=limit,
                 bounds=bounds,
@@ -838,90 +1373,159 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
                 show_only_with_images=False
             )
         
-        print(f"[ChatbotService] search_occurrences returned {results.get('totalRecords')} records")
-        print(f"[ChatbotService] ala_url from backend: {results.get('ala_url')}")
+        logger.debug(
+            "search_occurrences returned %s records, ala_url=%s",
+            results.get('totalRecords'), results.get('ala_url')
+        )
         
+        return self._format_search_results(results, kwargs)
+
+    def _shared_filter_search(self, filters: Dict, page_size: int) -> Dict:
+        """
+        search_occurrences for filters alone (no bounds or point radius), sharing the
+        request with an in-flight search for the same filters that can answer it: the
+        same page_size, or any page_size when only totals and facets are wanted
+        (page_size=0). Finished searches aren't kept - _search_cache covers repeats.
+        """
+        key = orjson.dumps(filters, option=orjson.OPT_SORT_KEYS)
+        with self._filter_searches_lock:
+            entry = self._filter_searches_in_flight.get(key)
+            if entry is not None and (page_size == 0 or entry[0] == page_size):
+                shared = entry[1]
+            else:
+                shared = None
+                owned = Future()
+                self._filter_searches_in_flight[key] = (page_size, owned)
+        if shared is not None:
+            logger.debug("Sharing in-flight Biocache search for filters=%s", filters)
+            return shared.result(timeout=self._SHARED_SEARCH_WAIT)
+        
+        try:
+            results = self.biocache_service.search_occurrences(
+                filters=filters,
+                page=0,
+                page_size=page_size,
+                show_only_with_images=False
+            )
+        except BaseException as e:
+            owned.set_exception(e)
+            raise
+        else:
+            owned.set_result(results)
+        finally:
+            with self._filter_searches_lock:
+                if self._filter_searches_in_flight.get(key, (None, None))[1] is owned:
+                    del self._filter_searches_in_flight[key]
+        return results
+
+    @staticmethod
+    def _bulk_matches_areas(results: Dict, areas: List[Dict]) -> bool:
+        """
+        Sanity check for search_occurrences_bulk: some rows came back, and when the
+        areas name states, at least one row lies in one of them
+        """
+        occurrences = results.get('occurrences')
+        if not occurrences:
+            return False
+        states = {area['state'] for area in areas if area.get('state')}
+        return not states or any(occ.get('stateProvince') in states for occ in occurrences)
+
+    def _format_search_results(self, results: Dict, kwargs: Dict) -> Dict:
+        """
+        Shape a Biocache result (single search or combined locations) into the
+        search_specimens tool result, honouring image_quality and compact
+        """
         # Determine image quality
         image_quality = kwargs.get('image_quality', 'thumbnail')
         
+        # Select the image extractor once - image_quality doesn't change per specimen
+        pick_image = self._IMAGE_SELECTORS.get(image_quality, self._NO_IMAGE)
+        
+        # Both search paths already cap occurrences at limit (page_size / unique-list
+        # cutoff), so no slice copy is needed here
+        occurrences = results['occurrences']
+        
         # Format results
         formatted_results = {
             "total_records": results['totalRecords'],
-            "returned_records": len(results['occurrences']),
-            "specimens": [],
+            "returned_records": len(occurrences),
             "ala_url": results.get('ala_url')
         }
         
-        for occ in results['occurrences'][:limit]:
-            # Select image URL based on quality
-            image_url = None
-            if image_quality == 'thumbnail':
-                image_url = occ.get('thumbnailUrl')
-            elif image_quality == 'medium':
-                image_url = occ.get('imageUrl')
-            elif image_quality == 'large':
-                image_url = occ.get('largeImageUrl')
-            elif image_quality == 'all':
-                image_url = {
-                    'thumbnail': occ.get('thumbnailUrl'),
-                    'medium': occ.get('imageUrl'),
-                    'large': occ.get('largeImageUrl'),
-                    'all_images': occ.get('images', [])
-                }
-            
-            specimen = {
-                "scientific_name": occ.get('scientificName'),
-                "common_name": occ.get('commonName'),
-                "catalog_number": occ.get('catalogNumber'),
-                "uuid": occ.get('id'),
-                "collection_name": occ.get('collectionName'),
-                "institution": occ.get('institutionName'),
-                "location": {
-                    "state": occ.get('stateProvince'),
-                    "locality": occ.get('locality'),
-                    "coordinates": {
-                        "latitude": occ.get('latitude'),
-                        "longitude": occ.get('longitude')
-                    },
-                    "coordinate_uncertainty_meters": occ.get('coordinateUncertaintyInMeters')
-                },
-                "date": {
-                    "event_date": occ.get('eventDate'),
-                    "year": occ.get('year'),
-                    "month": occ.get('month'),
-                    "day": occ.get('day')
-                },
-                "people": {
-                    "recorded_by": occ.get('recordedBy'),
-                    "identified_by": occ.get('identifiedBy')
-                },
-                "taxonomy": {
-                    "kingdom": occ.get('kingdom'),
-                    "phylum": occ.get('phylum'),
-                    "class": occ.get('class'),
-                    "order": occ.get('order'),
-                    "family": occ.get('family'),
-                    "genus": occ.get('genus'),
-                    "species": occ.get('species')
-                },
-                "images": image_url
-            }
-            formatted_results["specimens"].append(specimen)
+        if kwargs.get('compact'):
+            # Columnar shape: field names once, one flat list per specimen
+            fields = self._SPECIMEN_FIELDS
+            formatted_results['columns'] = self._SPECIMEN_COLUMNS
+            formatted_results['rows'] = [
+                [*fields(occ), pick_image(occ)]
+                for occ in occurrences
+            ]
+        else:
+            to_specimen = self._occ_to_specimen
+            formatted_results['specimens'] = [
+                to_specimen(occ, pick_image)
+                for occ in occurrences
+            ]
         
         if results.get('facets'):
             formatted_results['facets'] = results['facets']
         
-        with open(log_path, 'a') as f:
-            f.write(f"\n=== _search_specimens returning ===\n")
-            f.write(f"total_records: {formatted_results['total_records']}\n")
-            f.write(f"ala_url: {formatted_results.get('ala_url')}\n")
-            f.flush()
+        if results.get('partial_total'):
+            formatted_results['partial_total'] = True
         
-        print(f"[ChatbotService] Returning ala_url: {formatted_results.get('ala_url')}")
-        sys.stdout.flush()
+        logger.debug(
+            "_search_specimens returning total=%s ala_url=%s",
+            formatted_results['total_records'], formatted_results.get('ala_url')
+        )
         
         return formatted_results
 
+    @classmethod
+    def _occ_to_specimen(cls, occ: Dict, pick_image) -> Dict:
+        """Project a raw ALA occurrence onto the specimen shape the tools return"""
+        (scientific_name, common_name, catalog_number, uuid, collection_name,
+         institution, state, locality, latitude, longitude, uncertainty,
+         event_date, year, month, day, recorded_by, identified_by,
+         kingdom, phylum, taxon_class, order, family, genus, species) = cls._SPECIMEN_FIELDS(occ)
+        
+        return {
+            "scientific_name": scientific_name,
+            "common_name": common_name,
+            "catalog_number": catalog_number,
+            "uuid": uuid,
+            "collection_name": collection_name,
+            "institution": institution,
+            "location": {
+                "state": state,
+                "locality": locality,
+                "coordinates": {
+                    "latitude": latitude,
+                    "longitude": longitude
+                },
+                "coordinate_uncertainty_meters": uncertainty
+            },
+            "date": {
+                "event_date": event_date,
+                "year": year,
+                "month": month,
+                "day": day
+            },
+            "people": {
+                "recorded_by": recorded_by,
+                "identified_by": identified_by
+            },
+            "taxonomy": {
+                "kingdom": kingdom,
+                "phylum": phylum,
+                "class": taxon_class,
+                "order": order,
+                "family": family,
+                "genus": genus,
+                "species": species
+            },
+            "images": pick_image(occ)
+        }
+
     def _get_specimen_statistics_with_fallback(self, **kwargs) -> Dict:
         """Get statistics with fallback logic"""
         # Check for generic animal terms first
@@ -930,84 +1534,59 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
             taxonomy_mapping = self._get_taxonomy_for_generic_term(common_name)
             
             if taxonomy_mapping:
-                print(f"[ChatbotService] Statistics: '{common_name}' is a GENERIC ANIMAL TERM")
-                kwargs_copy = kwargs.copy()
-                del kwargs_copy['common_name']
+                logger.debug("Statistics: '%s' is a generic animal term", common_name)
+                rank, value = taxonomy_mapping['rank'], taxonomy_mapping['value']
                 
-                rank = taxonomy_mapping['rank']
-                value = taxonomy_mapping['value']
-                kwargs_copy[rank] = value
-                
-                return self._get_specimen_statistics(**kwargs_copy)
+                return self._get_specimen_statistics(**self._swap_name(kwargs, 'common_name', rank, value))
+        
+        # Resolve the fallback name alongside a slow query, as in
+        # _search_specimens_with_fallback
+        primary_done = threading.Event()
+        self._speculate_fallback_name(kwargs, primary_done)
         
         # Regular statistics
-        original_results = self._get_specimen_statistics(**kwargs)
+        try:
+            original_results = self._get_specimen_statistics(**kwargs)
+        finally:
+            primary_done.set()
         
         if original_results['total_records'] > 0:
             return original_results
         
-        print("[ChatbotService] No statistics with original query, attempting fallback...")
+        logger.debug("No statistics with original query, attempting fallback...")
         
         # Fallback: Vernacular → Scientific
         if kwargs.get('common_name'):
-            common_name = kwargs['common_name']
-            scientific_name = self._get_scientific_name_for_common(common_name)
+            scientific_name = self._get_scientific_name_for_common(kwargs['common_name'])
             
             if scientific_name:
-                kwargs_copy = kwargs.copy()
-                del kwargs_copy['common_name']
-                kwargs_copy['scientific_name'] = scientific_name
-                
-                fallback_results = self._get_specimen_statistics(**kwargs_copy)
+                fallback_results = self._get_specimen_statistics(
+                    **self._swap_name(kwargs, 'common_name', 'scientific_name', scientific_name)
+                )
                 if fallback_results['total_records'] > 0:
-                    print(f"[ChatbotService] ✓ Statistics fallback successful!")
+                    logger.debug("Statistics fallback successful")
                     return fallback_results
         
         # Fallback: Scientific → Vernacular
         elif kwargs.get('scientific_name'):
-            scientific_name = kwargs['scientific_name']
-            vernacular_name = self._get_vernacular_name_for_scientific(scientific_name)
+            vernacular_name = self._get_vernacular_name_for_scientific(kwargs['scientific_name'])
             
             if vernacular_name:
-                kwargs_copy = kwargs.copy()
-                del kwargs_copy['scientific_name']
-                kwargs_copy['common_name'] = vernacular_name
-                
-                fallback_results = self._get_specimen_statistics(**kwargs_copy)
+                fallback_results = self._get_specimen_statistics(
+                    **self._swap_name(kwargs, 'scientific_name', 'common_name', vernacular_name)
+                )
                 if fallback_results['total_records'] > 0:
-                    print(f"[ChatbotService] ✓ Statistics fallback successful!")
+                    logger.debug("Statistics fallback successful")
                     return fallback_results
         
         return original_results
 
     def _get_specimen_statistics(self, **kwargs) -> Dict:
         """Get statistics - handles both regular filters and taxonomic rank filters"""
-        filters = {}
-        
-        # Regular name filters
-        if kwargs.get('scientific_name'):
-            filters['scientific_name'] = kwargs['scientific_name']
-        elif kwargs.get('common_name'):
-            filters['common_name'] = kwargs['common_name']
+        filters = self._build_filters(kwargs, self._STATISTICS_KWARG_TO_FILTER)
         
-        # Handle higher taxonomy filters
-        for rank in ['kingdom', 'phylum', 'class', 'order', 'family', 'genus', 'infraclass', 'subphylum', 'subclass']:
-            if kwargs.get(rank):
-                filters[rank] = kwargs[rank]
-        
-        if kwargs.get('state_province'):
-            filters['state_province'] = kwargs['state_province']
-        if kwargs.get('collection_name'):
-            filters['collection_name'] = kwargs['collection_name']
-        if kwargs.get('year_range'):
-            yr = kwargs['year_range']
-            filters['year_range'] = f"[{yr['start_year']} TO {yr['end_year']}]"
-        
-        results = self.biocache_service.search_occurrences(
-            filters=filters if filters else None,
-            page=0,
-            page_size=0
-        )
+        # Counts and facets only - any search for the same filters carries them
+        results = self._shared_filter_search(filters, 0)
         
         statistics = {
             "total_records": results['totalRecords'],
@@ -1015,28 +1594,17 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
             "ala_url": results.get('ala_url')  # Include ALA URL for statistics too
         }
         
-        print(f"[ChatbotService] Statistics query returned {results['totalRecords']} total records")
-        print(f"[ChatbotService] Statistics ala_url: {results.get('ala_url')}")
+        logger.debug(
+            "Statistics query returned %s total records, ala_url=%s",
+            results['totalRecords'], results.get('ala_url')
+        )
         
         requested_facets = kwargs.get('include_facets', [])
         all_facets = results.get('facets', {})
         
         if requested_facets:
-            facet_mapping = {
-                'year': 'year',
-                'state_province': 'state_province',
-                'collection_name': 'collection_name',
-                'family': 'family',
-                'order': 'order',
-                'class': 'class',
-                'genus': 'genus',
-                'institution': 'institution'
-            }
-            
-            for facet_name in requested_facets:
-                mapped_name = facet_mapping.get(facet_name)
-                if mapped_name and mapped_name in all_facets:
-                    statistics['faceted_counts'][facet_name] = all_facets[mapped_name]
+            wanted = self._FACET_NAMES.intersection(requested_facets, all_facets.keys())
+            statistics['faceted_counts'] = {name: all_facets[name] for name in wanted}
         else:
             statistics['faceted_counts'] = all_facets
         
@@ -1055,219 +1623,474 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
         
         occ = results['occurrences'][0]
         
-        specimen = {
-            "scientific_name": occ.get('scientificName'),
-            "common_name": occ.get('commonName'),
-            "catalog_number": occ.get('catalogNumber'),
-            "uuid": occ.get('id'),
-            "collection": {
-                "name": occ.get('collectionName'),
-                "institution": occ.get('institutionName'),
-                "basis_of_record": occ.get('basisOfRecord')
-            },
-            "location": {
-                "state": occ.get('stateProvince'),
-                "locality": occ.get('locality'),
-                "latitude": occ.get('latitude'),
-                "longitude": occ.get('longitude'),
-                "coordinate_uncertainty_meters": occ.get('coordinateUncertaintyInMeters')
-            },
-            "temporal": {
-                "event_date": occ.get('eventDate'),
-                "year": occ.get('year'),
-                "month": occ.get('month'),
-                "day": occ.get('day')
-            },
-            "people": {
-                "recorded_by": occ.get('recordedBy'),
-                "identified_by": occ.get('identifiedBy')
-            },
-            "taxonomy": {
-                "kingdom": occ.get('kingdom'),
-                "phylum": occ.get('phylum'),
-                "class": occ.get('class'),
-                "order": occ.get('order'),
-                "family": occ.get('family'),
-                "genus": occ.get('genus'),
-                "species": occ.get('species')
-            },
-            "images": {
-                "thumbnail": occ.get('thumbnailUrl'),
-                "medium": occ.get('imageUrl'),
-                "large": occ.get('largeImageUrl'),
-                "all": occ.get('images', [])
-            }
-        }
+        specimen = self._occ_to_specimen(occ, self._IMAGE_SELECTORS['all'])
+        specimen["basis_of_record"] = occ.get('basisOfRecord')
         
         return {"specimen": specimen, "found": True}
 
+    @staticmethod
+    def _is_templated(tool_call) -> bool:
+        """
+        Whether a tool call is answered from a template instead of a second model call:
+        a single specimen record, or counts (and breakdowns) the model flagged with count_only
+        """
+        if tool_call.function.name == "get_specimen_by_id":
+            return True
+        if tool_call.function.name != "get_specimen_statistics":
+            return False
+        return bool(orjson.loads(tool_call.function.arguments).get("count_only"))
+
+    def _render_tool_result(self, tool_call, result: Dict) -> str:
+        """Template answer for a tool call _is_templated accepted"""
+        if tool_call.function.name == "get_specimen_by_id":
+            return self._render_specimen(result)
+        return self._render_count(orjson.loads(tool_call.function.arguments), result)
+
+    # How facets read in templated answers, and how many values of each to list
+    _FACET_LABELS = MappingProxyType({
+        'state_province': 'state',
+        'collection_name': 'collection',
+    })
+    _TEMPLATE_FACET_VALUES = 5
+
+    @classmethod
+    def _render_count(cls, arguments: Dict, result: Dict) -> str:
+        """Plain-English count (plus top facet values) for a count_only get_specimen_statistics result"""
+        if arguments.get("scientific_name"):
+            subject = f"*{arguments['scientific_name']}* "
+        elif arguments.get("common_name"):
+            subject = f"{arguments['common_name']} "
+        else:
+            subject = next((f"{arguments[rank]} " for rank in cls._TAXON_RANKS if arguments.get(rank)), "")
+        
+        scope = ""
+        if arguments.get("state_province"):
+            scope += f" from {arguments['state_province']}"
+        if arguments.get("collection_name"):
+            scope += f" in the {arguments['collection_name']} collection"
+        year_range = arguments.get("year_range") or {}
+        if year_range.get("start_year") and year_range.get("end_year"):
+            scope += f" collected between {year_range['start_year']} and {year_range['end_year']}"
+        
+        total = result["total_records"]
+        if total:
+            noun = "specimen" if total == 1 else "specimens"
+            sentence = f"The collection contains {total:,} {subject}{noun}{scope}."
+        else:
+            sentence = f"The collection has no {subject}specimens{scope} on record."
+        
+        if result.get("ala_url"):
+            sentence += f" [View on Atlas of Living Australia]({result['ala_url']})"
+        
+        # Top values of each breakdown the user asked for, in the order asked
+        lines = [sentence]
+        for facet in arguments.get("include_facets") or ():
+            values = result["faceted_counts"].get(facet)
+            if not total or not values:
+                continue
+            lines.append(f"\nBy {cls._FACET_LABELS.get(facet, facet)}:")
+            lines.extend(
+                f"• {item['value']}: {item['count']:,}" for item in values[:cls._TEMPLATE_FACET_VALUES]
+            )
+        return "\n".join(lines)
+
+    @staticmethod
+    def _render_specimen(result: Dict) -> str:
+        """Plain-English summary of a get_specimen_by_id result, used in place of a model reply"""
+        specimen = result["specimen"]
+        location = specimen["location"]
+        
+        name = f"*{specimen['scientific_name']}*" if specimen["scientific_name"] else "an unidentified specimen"
+        if specimen["common_name"]:
+            name += f" ({specimen['common_name']})"
+        
+        sentences = [f"Catalogue number {specimen['catalog_number']} is {name}"]
+        if specimen["collection_name"] or specimen["institution"]:
+            held_by = ", ".join(part for part in (specimen["collection_name"], specimen["institution"]) if part)
+            sentences[0] += f", held in {held_by}"
+        sentences[0] += "."
+        
+        place = ", ".join(part for part in (location["locality"], location["state"]) if part)
+        collected = "It was collected"
+        if place:
+            collected += f" at {place}"
+        if specimen["date"]["event_date"]:
+            collected += f" on {specimen['date']['event_date']}"
+        if specimen["people"]["recorded_by"]:
+            collected += f" by {specimen['people']['recorded_by']}"
+        if collected != "It was collected":
+            sentences.append(collected + ".")
+        
+        image = specimen["images"]["large"] or specimen["images"]["medium"] or specimen["images"]["thumbnail"]
+        if image:
+            sentences.append(f"See image: {image}")
+        
+        return " ".join(sentences)
+
     def process_message(
         self, 
         message: str, 
         session_id: str = "default",
         image_data: Optional[str] = None
     ) -> Dict:
-        """Process message - logs errors and provides helpful responses"""
+        """
+        Process message - logs errors and provides helpful responses.
+        Drains process_message_stream, so the final answer is still generated with
+        stream=True and both endpoints share one code path.
+        """
+        for event in self.process_message_stream(message, session_id, image_data):
+            if event.pop("event") != "delta":
+                return event
+
+    def process_message_stream(
+        self,
+        message: str,
+        session_id: str = "default",
+        image_data: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Streaming variant of process_message. Yields {"event": "delta", "content": ...}
+        as the final answer is generated, then one {"event": "done", ...} carrying the
+        same payload process_message returns (with the cleaned response text), or
+        {"event": "error", ...} on failure.
+        The tool-selection call streams too, so a plain-text answer reaches the client
+        as it is generated; tool calls are dispatched once their deltas are complete.
+        """
+        owned = Future()
+        payload = None
         try:
-            conversation = self.get_or_create_session(session_id)
-            
-            user_message = {"role": "user", "content": []}
-            
-            if message:
-                user_message["content"].append({
-                    "type": "text",
-                    "text": message
-                })
-            
-            if image_data:
-                if image_data.startswith('data:image'):
-                    image_data = image_data.split(',')[1]
-                
-                user_message["content"].append({
-                    "type": "image_url",
-                    "image_url": {
-                        "url": f"data:image/jpeg;base64,{image_data}",
-                        "detail": "high"
-                    }
-                })
-                
-                if not message:
-                    user_message["content"].insert(0, {
-                        "type": "text",
-                        "text": "Identify the animal species in this image. Provide scientific name, common name, taxonomic classification, and key identifying features."
-                    })
+            turn_key = self._turn_key(message, image_data)
+            repeated = self._repeated_response(session_id, turn_key, owned)
+            if repeated is not None:
+                # Double submit - the history already holds this exchange once
+                payload = repeated
+                yield {"event": "delta", "content": repeated["response"]}
+                yield {"event": "done", **repeated}
+                return
             
-            conversation.append(user_message)
+            history = self._start_turn(message, session_id, image_data)
             
-            conversation = self._trim_conversation_history(conversation)
-            self.conversations[session_id] = conversation
-            
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model=self.model,
-                messages=conversation,
-                tools=self.tools,
-                tool_choice="auto"
+                messages=self._messages_for_model(history),
+                tools=self._TOOLS,
+                tool_choice="auto",
+                prompt_cache_key=self._PROMPT_CACHE_KEY,
+                stream=True
             )
             
-            message_response = response.choices[0].message
+            message_response = yield from self._stream_first_response(stream)
             
-            if message_response.tool_calls:
-                tool_results = []
-                
-                for tool_call in message_response.tool_calls:
-                    function_name = tool_call.function.name
-                    function_args = json.loads(tool_call.function.arguments)
-                    
-                    print(f"Executing: {function_name}({function_args})")
-                    
-                    function_result = self.execute_function(function_name, function_args)
-                    
-                    tool_results.append({
-                        "tool_call_id": tool_call.id,
-                        "role": "tool",
-                        "name": function_name,
-                        "content": json.dumps(function_result)
-                    })
-                
-                conversation.append({
-                    "role": "assistant",
-                    "content": message_response.content,
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        } for tc in message_response.tool_calls
-                    ]
-                })
+            if message_response.tool_calls and all(
+                self._is_templated(tc) for tc in message_response.tool_calls
+            ):
+                # Deterministic lookups answer from a template - no second model call
+                tool_results = self._run_tool_calls(history, message_response)
+                assistant_message = "\n\n".join(
+                    self._render_tool_result(tc, orjson.loads(result["content"]))
+                    for tc, result in zip(message_response.tool_calls, tool_results)
+                )
+                response_type = "data_response" if not image_data else "image_and_data_response"
+                yield {"event": "delta", "content": assistant_message}
                 
-                for tool_result in tool_results:
-                    conversation.append(tool_result)
+            elif message_response.tool_calls:
+                tool_results = self._run_tool_calls(history, message_response)
                 
-                final_response = self.client.chat.completions.create(
+                # Same tools as the first call (but none may be called) so the request
+                # shares its cached prefix: tools + system prompt + history so far
+                stream = self.client.chat.completions.create(
                     model=self.model,
-                    messages=conversation
+                    messages=self._messages_for_model(history),
+                    tools=self._TOOLS,
+                    tool_choice="none",
+                    prompt_cache_key=self._PROMPT_CACHE_KEY,
+                    stream=True
                 )
                 
-                assistant_message = final_response.choices[0].message.content
+                parts = []
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        parts.append(delta)
+                        yield {"event": "delta", "content": delta}
+                
                 response_type = "data_response" if not image_data else "image_and_data_response"
                 
-                # Clean the response to remove JSON, fix URLs, etc.
+                # Streamed text is raw model output; "done" carries the cleaned version
                 assistant_message = self.response_cleaner.clean_response(
-                    assistant_message, 
+                    "".join(parts),
                     tool_results
                 )
                 
             else:
+                # Already streamed to the client by _stream_first_response
                 assistant_message = message_response.content
                 response_type = "image_analysis" if image_data else "text_response"
-        
-            conversation.append({
-                "role": "assistant",
-                "content": assistant_message
-            })
             
-            return {
-                "success": True,
-                "response": assistant_message,
-                "session_id": session_id,
-                "type": response_type,
-                "suggestions": self.get_contextual_suggestions(image_data is not None)
-            }
-            
-        except Exception as e:
-            print(f"ERROR in process_message: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            payload = self._finish_turn(session_id, history, assistant_message, response_type, image_data)
+            with self._turns_lock:
+                self._last_answers[session_id] = (turn_key, payload)
             
-            error_msg = "I encountered an error searching the collection. "
+            yield {"event": "done", **payload}
             
-            if "common_name" in str(e).lower() or "vernacular" in str(e).lower():
-                error_msg += "The common name search may not have matched any records. Try using the scientific name instead."
-            elif "no specimen found" in str(e).lower():
-                error_msg += "No specimens matched your search criteria."
-            elif "api" in str(e).lower() or "connection" in str(e).lower():
-                error_msg += "There was a problem connecting to the ALA database. Please try again."
+        except Exception as e:
+            logger.exception("ERROR in process_message: %s", e)
+            yield {"event": "error", **self._error_response(e, session_id)}
+        finally:
+            self._release_turn(session_id, owned, payload)
+
+    @staticmethod
+    def _stream_first_response(stream) -> Iterator[Dict]:
+        """
+        Consume the streamed tool-selection call, yielding content deltas as they
+        arrive, and return the assembled message (as the generator's return value).
+        Tool calls come in pieces keyed by index - the id and name in the first
+        piece, the JSON arguments spread across the rest.
+        """
+        parts = []
+        calls = {}
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                parts.append(delta.content)
+                yield {"event": "delta", "content": delta.content}
+            for piece in delta.tool_calls or ():
+                call = calls.setdefault(piece.index, {"id": None, "name": "", "arguments": []})
+                if piece.id:
+                    call["id"] = piece.id
+                if piece.function and piece.function.name:
+                    call["name"] += piece.function.name
+                if piece.function and piece.function.arguments:
+                    call["arguments"].append(piece.function.arguments)
+        
+        # Same shape as a non-streamed message, which is what the tool dispatch reads
+        tool_calls = [
+            SimpleNamespace(
+                id=call["id"],
+                function=SimpleNamespace(name=call["name"], arguments="".join(call["arguments"]))
+            ) for _, call in sorted(calls.items())
+        ]
+        return SimpleNamespace(content="".join(parts) or None, tool_calls=tool_calls or None)
+
+    @staticmethod
+    def _turn_key(message: str, image_data: Optional[str]) -> str:
+        """Digest of a user turn's text and image, for spotting a repeated message"""
+        digest = hashlib.blake2b(message.encode(), digest_size=16)
+        digest.update(b"\0")
+        digest.update((image_data or "").encode())
+        return digest.hexdigest()
+
+    def _repeated_response(self, session_id: str, turn_key: str, owned: Future) -> Optional[Dict]:
+        """
+        The response payload for a double-submitted message, else None. Waits for the
+        identical turn if it is still running, or reuses the session's last response
+        if it was for the same message and is still within the window. Otherwise
+        registers owned as this session's in-flight turn. The stored history must
+        end with the answer being replayed, so a turn taken on another worker (or a
+        cleared session) never replays a stale reply.
+        """
+        with self._turns_lock:
+            in_flight = self._turns_in_flight.get(session_id)
+            if in_flight is not None and in_flight[0] == turn_key:
+                shared = in_flight[1]
+                payload = None
             else:
-                error_msg += "Please try rephrasing your question or contact support if this persists."
+                shared = None
+                self._turns_in_flight[session_id] = (turn_key, owned)
+                last = self._last_answers.get(session_id)
+                payload = last[1] if last is not None and last[0] == turn_key else None
+        if shared is not None:
+            logger.debug("Waiting for the identical in-flight turn in session %s", session_id)
+            # None if that turn failed - this request then runs the turn itself
+            payload = shared.result(timeout=self._DUPLICATE_TURN_WAIT)
+        if payload is None:
+            return None
+        
+        history = self._peek_session(session_id)
+        if not history or history[-1].role != 'assistant' or history[-1].content != payload["response"]:
+            return None
+        return payload
+
+    def _release_turn(self, session_id: str, owned: Future, payload: Optional[Dict]) -> None:
+        """Finish this request's in-flight registration, handing its payload to any waiters"""
+        with self._turns_lock:
+            entry = self._turns_in_flight.get(session_id)
+            if entry is not None and entry[1] is owned:
+                del self._turns_in_flight[session_id]
+        owned.set_result(payload)
+
+    def _start_turn(self, message: str, session_id: str, image_data: Optional[str]) -> Deque[Message]:
+        """Add the user's message (and image) to the session history and return the history"""
+        if image_data:
+            # Browser uploads arrive as a full data URL - pass those through as-is
+            # rather than splitting and re-joining a multi-MB string
+            if image_data.startswith('data:image'):
+                image_url = image_data
+                _, _, payload = image_data.partition(',')
+            else:
+                payload = image_data
+                image_url = f"data:image/jpeg;base64,{image_data}"
             
-            return {
-                "success": False,
-                "response": error_msg,
-                "session_id": session_id,
-                "error": str(e),
-                "suggestions": self.get_default_suggestions()
-            }
+            # Fail fast on a corrupt upload instead of after an OpenAI round trip
+            try:
+                base64.b64decode(payload, validate=True)
+            except ValueError:
+                raise ValueError("Invalid image data: expected base64-encoded image") from None
+        
+        history = self.get_or_create_session(session_id)
+        
+        user_message = Message("user", [])
+        
+        if message:
+            user_message.content.append({
+                "type": "text",
+                "text": message
+            })
+        
+        if image_data:
+            user_message.content.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": image_url,
+                    "detail": "high"
+                }
+            })
+            
+            if not message:
+                user_message.content.insert(0, {
+                    "type": "text",
+                    "text": "Identify the animal species in this image. Provide scientific name, common name, taxonomic classification, and key identifying features."
+                })
+        
+        history.append(user_message)
+        
+        # Images from earlier turns have already been identified - don't re-upload them
+        self._strip_old_images(history, user_message)
+        self._trim_conversation_history(history)
+        self._save_session(session_id, history)
+        
+        return history
 
-    def get_contextual_suggestions(self, had_image: bool) -> List[str]:
-        """Get contextual suggestions"""
-        if had_image:
-            return [
-                "Search for this species in our collection",
-                "Where has this species been found?",
-                "Show me more specimens with images"
-            ]
-        return [
-            "Show me specimens from a specific collector",
-            "What's the distribution by state?",
-            "Find specimens from a specific year range"
+    def _run_tool_calls(self, history: Deque[Message], message_response) -> List[Dict]:
+        """
+        Execute the model's tool calls, append the assistant tool_calls message and
+        the tool results to the history, and return the tool result messages
+        """
+        tool_calls = message_response.tool_calls
+        
+        # Parse every argument payload up front so malformed JSON fails
+        # before any ALA request is sent
+        parsed_args = [orjson.loads(tc.function.arguments) for tc in tool_calls]
+        
+        if len(tool_calls) == 1:
+            # Nothing to overlap with - run it here rather than handing off to the pool
+            logger.debug("Executing: %s(%s)", tool_calls[0].function.name, parsed_args[0])
+            contents = [self._execute_function_json(tool_calls[0].function.name, parsed_args[0])]
+        else:
+            # Tool calls are independent ALA requests - run them concurrently. Each worker
+            # also serialises its own result, so large specimen lists encode in parallel
+            # rather than one after another on the request thread.
+            futures = []
+            for tool_call, function_args in zip(tool_calls, parsed_args):
+                logger.debug("Executing: %s(%s)", tool_call.function.name, function_args)
+                futures.append(self.tool_executor.submit(
+                    self._execute_function_json, tool_call.function.name, function_args
+                ))
+            # Collect in the original order so tool_call_ids line up
+            contents = [future.result() for future in futures]
+        
+        tool_messages = [
+            Message("tool", content, tool_call_id=tool_call.id, name=tool_call.function.name)
+            for tool_call, content in zip(tool_calls, contents)
         ]
+        
+        history.append(Message(
+            "assistant",
+            message_response.content,
+            tool_calls=[
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments
+                    }
+                } for tc in tool_calls
+            ]
+        ))
+        history.extend(tool_messages)
+        
+        # ResponseCleaner reads the tool results as message dicts
+        return [msg.to_openai() for msg in tool_messages]
+
+    def _execute_function_json(self, function_name: str, arguments: Dict) -> str:
+        """execute_function, returning the result already encoded as the tool message content"""
+        return orjson.dumps(self.execute_function(function_name, arguments)).decode()
+
+    def _finish_turn(
+        self,
+        session_id: str,
+        history: Deque[Message],
+        assistant_message: str,
+        response_type: str,
+        image_data: Optional[str]
+    ) -> Dict:
+        """Store the assistant's reply and build the response payload for the route"""
+        history.append(Message("assistant", assistant_message))
+        self._save_session(session_id, history)
+        
+        return {
+            "success": True,
+            "response": assistant_message,
+            "session_id": session_id,
+            "type": response_type,
+            "suggestions": self.get_contextual_suggestions(image_data is not None)
+        }
+
+    def _error_response(self, e: Exception, session_id: str) -> Dict:
+        """User-facing error payload for a failed turn"""
+        error_msg = "I encountered an error searching the collection. "
+        
+        if "common_name" in str(e).lower() or "vernacular" in str(e).lower():
+            error_msg += "The common name search may not have matched any records. Try using the scientific name instead."
+        elif "no specimen found" in str(e).lower():
+            error_msg += "No specimens matched your search criteria."
+        elif "invalid image data" in str(e).lower():
+            error_msg = "I couldn't read that image. Please try uploading it again as a JPEG or PNG."
+        elif "api" in str(e).lower() or "connection" in str(e).lower():
+            error_msg += "There was a problem connecting to the ALA database. Please try again."
+        else:
+            error_msg += "Please try rephrasing your question or contact support if this persists."
+        
+        return {
+            "success": False,
+            "response": error_msg,
+            "session_id": session_id,
+            "error": str(e),
+            "suggestions": self.get_default_suggestions()
+        }
+
+    def get_contextual_suggestions(self, had_image: bool) -> Tuple[str, ...]:
+        """Get contextual suggestions"""
+        return self._SUGGESTIONS_IMAGE if had_image else self._SUGGESTIONS_NO_IMAGE
 
-    def get_default_suggestions(self) -> List[str]:
+    def get_default_suggestions(self) -> Tuple[str, ...]:
         """Get default suggestions"""
-        return [
-            "Show me kangaroo specimens from NSW",
-            "How many fish specimens are in the collection?",
-            "What species were collected in the 1980s?"
-        ]
+        return self._SUGGESTIONS_DEFAULT
 
     def clear_session(self, session_id: str = "default") -> Dict:
         """Clear conversation history"""
-        if session_id in self.conversations:
-            del self.conversations[session_id]
+        if self.redis is not None:
+            self.redis.delete(self._redis_key(session_id))
+        else:
+            with self._sessions_lock:
+                self.conversations.pop(session_id, None)
+        with self._turns_lock:
+            self._last_answers.pop(session_id, None)
         return {
             "success": True,
             "message": "Conversation history cleared",
@@ -1276,10 +2099,15 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
 
     def get_session_history(self, session_id: str = "default") -> Dict:
         """Get conversation history"""
-        conversation = self.get_or_create_session(session_id)
+        # Read-only: don't create (or LRU-evict for) a session just to report it's empty
+        if self.redis is not None:
+            history = self._load_redis_history(session_id)
+        else:
+            with self._sessions_lock:
+                history = self.conversations.get(session_id, ())
         display_history = [
-            msg for msg in conversation[1:]
-            if msg.get("role") in ["user", "assistant"] and msg.get("content")
+            msg.to_openai() for msg in history
+            if msg.role in self._DISPLAY_ROLES and msg.content
         ]
         
         return {
@@ -1287,4 +2115,112 @@ You: Call get_specimen_statistics with common_name="frog", then respond naturall
             "history": display_history,
             "session_id": session_id,
             "message_count": len(display_history)
-        }
\ No newline at end of file
+        }
+
+    def get_session_stats(self) -> Optional[Dict]:
+        """In-memory session counts for /health, to help size max_sessions (None when sessions live in Redis)"""
+        if self.redis is not None:
+            return None
+        with self._sessions_lock:
+            return {
+                "active": len(self.conversations),
+                "max": self.max_sessions,
+                "evicted": self.conversations.evictions,
+                "expired": self.conversations.expirations
+            }
+
+    # =============================================================
+    # BATCH API (offline / bulk workloads - not used by the chat UI)
+    # =============================================================
+    # Batch statuses after which nothing more will be written
+    _BATCH_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+    def submit_batch(self, prompts: List[Dict]) -> Dict:
+        """
+        Submit many one-shot prompts through the OpenAI Batch API (half price,
+        separate rate limit, results within 24h).
+        Each prompt is {"custom_id": str, "message": str}. Tool calls in the
+        results are returned as-is - batch jobs don't run the ALA tools.
+        """
+        lines = [
+            orjson.dumps({
+                "custom_id": prompt["custom_id"],
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "tools": self._TOOLS,
+                    "prompt_cache_key": self._PROMPT_CACHE_KEY,
+                    "messages": [
+                        self._SYSTEM_MESSAGE,
+                        {"role": "user", "content": prompt["message"]}
+                    ]
+                }
+            })
+            for prompt in prompts
+        ]
+        
+        batch_file = self.client.files.create(
+            file=("chatbot_batch.jsonl", b"\n".join(lines)),
+            purpose="batch"
+        )
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        logger.debug("Submitted batch %s with %d requests", batch.id, len(lines))
+        
+        return {"batch_id": batch.id, "status": batch.status, "request_count": len(lines)}
+
+    def get_batch_results(self, batch_id: str) -> Dict:
+        """
+        Poll a submitted batch; once it has finished, returns parsed results keyed by
+        custom_id - including any partial output of a failed, expired or cancelled batch
+        and the per-request errors from its error file
+        """
+        batch = self.client.batches.retrieve(batch_id)
+        
+        results = {}
+        if batch.status in self._BATCH_FINAL_STATUSES:
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    self._read_batch_file(file_id, results)
+        
+        return {"batch_id": batch_id, "status": batch.status, "results": results}
+
+    def wait_for_batch(
+        self,
+        batch_id: str,
+        timeout: float = 86400,
+        initial_delay: float = 5.0,
+        max_delay: float = 300.0
+    ) -> Dict:
+        """
+        Block until a batch finishes, polling with exponential backoff, and return
+        get_batch_results. Returns the in-progress status if timeout runs out first.
+        """
+        deadline = time.monotonic() + timeout
+        delay = initial_delay
+        while True:
+            result = self.get_batch_results(batch_id)
+            if result["status"] in self._BATCH_FINAL_STATUSES or time.monotonic() + delay > deadline:
+                return result
+            
+            logger.debug("Batch %s is %s, checking again in %.0fs", batch_id, result["status"], delay)
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+    def _read_batch_file(self, file_id: str, results: Dict) -> None:
+        """Parse a batch output/error JSONL file into results, keyed by custom_id"""
+        content = self.client.files.content(file_id)
+        for line in content.text.splitlines():
+            if not line:
+                continue
+            record = orjson.loads(line)
+            body = (record.get("response") or {}).get("body") or {}
+            choices = body.get("choices") or [{}]
+            results[record["custom_id"]] = {
+                "message": choices[0].get("message"),
+                "error": record.get("error") or body.get("error")
+            }
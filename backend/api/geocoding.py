@@ -2,10 +2,60 @@
 Geocoding service for converting location names to coordinates
 Uses Google Geocoding API to handle Australian suburbs, cities, and regions
 """
+import logging
+import re
+import sqlite3
+import threading
+import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from cachetools import LRUCache
 from typing import Optional, Dict
 from config import Config
 
+# Debug trace goes through the api package logger set up in api.chatbot
+logger = logging.getLogger(__name__)
+
+
+STATE_ABBREVIATIONS = {
+    'NSW': 'New South Wales',
+    'VIC': 'Victoria',
+    'QLD': 'Queensland',
+    'SA': 'South Australia',
+    'WA': 'Western Australia',
+    'TAS': 'Tasmania',
+    'NT': 'Northern Territory',
+    'ACT': 'Australian Capital Territory'
+}
+
+# Trailing state: full names only after a comma ("Sydney, New South Wales") since
+# "Mount Victoria" is a place name, abbreviations after a comma or space ("Sydney NSW")
+_STATE_SUFFIX_RE = re.compile(
+    r'(?:,\s*(' + '|'.join(
+        re.escape(name.casefold())
+        for name in sorted([*STATE_ABBREVIATIONS.values(), *STATE_ABBREVIATIONS], key=len, reverse=True)
+    ) + r')|\s+(' + '|'.join(abbrev.casefold() for abbrev in STATE_ABBREVIATIONS) + r'))$'
+)
+_COUNTRY_SUFFIX_RE = re.compile(r',\s*australia$')
+_STATE_KEYS = {name.casefold(): abbrev.casefold() for abbrev, name in STATE_ABBREVIATIONS.items()}
+_STATE_KEYS.update({abbrev.casefold(): abbrev.casefold() for abbrev in STATE_ABBREVIATIONS})
+
+
+def _normalize_locality(location: str) -> str:
+    """
+    Cache key for a location string. Case, spacing, a trailing ", Australia" and the
+    spelling of a trailing state are ignored, so "Sydney NSW", "sydney,  NSW" and
+    "Sydney, New South Wales, Australia" share an entry. The state itself is kept -
+    "Richmond" and "Richmond VIC" geocode differently.
+    """
+    key = " ".join(location.casefold().split())
+    key = _COUNTRY_SUFFIX_RE.sub('', key)
+    match = _STATE_SUFFIX_RE.search(key)
+    if match:
+        key = f"{key[:match.start()]} {_STATE_KEYS[match.group(1) or match.group(2)]}"
+    return key
+
 
 class GeocodingService:
     """
@@ -13,10 +63,31 @@ class GeocodingService:
     for spatial queries in the ALA Biocache API
     """
     
+    # Stored geocodes older than this are re-fetched - Google's terms allow
+    # caching coordinates for up to 30 days
+    _PERSIST_MAX_AGE = 30 * 86400
+    
     def __init__(self):
         self.api_key = Config.GOOGLE_GEOCODING_API_KEY
         self.base_url = "https://maps.googleapis.com/maps/api/geocode/json"
-        self.cache = {}  # Simple in-memory cache to reduce API calls
+        # Bounded LRU of geocodes - suburb coordinates don't change, so no TTL is needed
+        self.cache = LRUCache(maxsize=1024)
+        self._cache_lock = threading.Lock()
+        # Geocodes also persist in SQLite so restarts and other gunicorn workers
+        # don't re-query Google (GEOCODE_CACHE_DB='' keeps them in memory only)
+        self._db = None
+        self._db_lock = threading.Lock()
+        if Config.GEOCODE_CACHE_DB:
+            self._db = sqlite3.connect(Config.GEOCODE_CACHE_DB, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS geocodes "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        # Keep-alive session so cache misses skip the TLS handshake with Google
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=16))
     
     def geocode_location(self, location: str, bias_to_australia: bool = True, return_all_matches: bool = False) -> Optional[Dict]:
         """
@@ -44,11 +115,20 @@ class GeocodingService:
             }
             Or None if geocoding fails
         """
-        # Check cache first
-        cache_key = f"{location}_{bias_to_australia}_{return_all_matches}"
-        if cache_key in self.cache:
-            print(f"[GeocodingService] Cache hit for '{location}'")
-            return self.cache[cache_key]
+        # Check cache first ("Castle Hill" and "castle hill, NSW " share an entry)
+        cache_key = (_normalize_locality(location), bias_to_australia, return_all_matches)
+        with self._cache_lock:
+            cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Cache hit for '%s'", location)
+            return cached
+        
+        cached = self._load_persisted(cache_key)
+        if cached is not None:
+            logger.debug("Geocode store hit for '%s'", location)
+            with self._cache_lock:
+                self.cache[cache_key] = cached
+            return cached
         
         try:
             # Add "Australia" to bias results toward Australian locations
@@ -61,10 +141,10 @@ class GeocodingService:
                 'components': 'country:AU'  # Restrict to Australia
             }
             
-            print(f"[GeocodingService] Geocoding: '{search_query}'")
-            response = requests.get(self.base_url, params=params, timeout=5)
+            logger.debug("Geocoding: '%s'", search_query)
+            response = self.session.get(self.base_url, params=params, timeout=5)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             if data['status'] == 'OK' and data['results']:
                 
@@ -88,41 +168,67 @@ class GeocodingService:
                         all_results.append(geocoded_result)
                 
                 if not all_results:
-                    print(f"[GeocodingService] No Australian results for '{location}'")
+                    logger.debug("No Australian results for '%s'", location)
                     return None
                 
-                # Log what we found
-                if len(all_results) > 1:
-                    print(f"[GeocodingService] Found {len(all_results)} locations named '{location}' in Australia:")
-                    for idx, res in enumerate(all_results, 1):
-                        print(f"[GeocodingService]   {idx}. {res['formatted_address']} ({res['state']})")
-                else:
-                    print(f"[GeocodingService] ✓ Geocoded '{location}' to: {all_results[0]['latitude']}, {all_results[0]['longitude']}")
-                    print(f"[GeocodingService]   Formatted: {all_results[0]['formatted_address']}")
-                    print(f"[GeocodingService]   Type: {all_results[0]['place_type']}")
+                # Log what we found (skip walking the results unless debug logging is on)
+                if logger.isEnabledFor(logging.DEBUG):
+                    if len(all_results) > 1:
+                        logger.debug("Found %s locations named '%s' in Australia:", len(all_results), location)
+                        for idx, res in enumerate(all_results, 1):
+                            logger.debug("  %s. %s (%s)", idx, res['formatted_address'], res['state'])
+                    else:
+                        logger.debug("✓ Geocoded '%s' to: %s, %s", location, all_results[0]['latitude'], all_results[0]['longitude'])
+                        logger.debug("  Formatted: %s", all_results[0]['formatted_address'])
+                        logger.debug("  Type: %s", all_results[0]['place_type'])
                 
                 # Cache and return
-                if return_all_matches:
-                    self.cache[cache_key] = all_results
-                    return all_results
-                else:
-                    # Return primary (first) result
-                    self.cache[cache_key] = all_results[0]
-                    return all_results[0]
+                result = all_results if return_all_matches else all_results[0]  # primary (first) result
+                with self._cache_lock:
+                    self.cache[cache_key] = result
+                self._persist(cache_key, result)
+                return result
             
             elif data['status'] == 'ZERO_RESULTS':
-                print(f"[GeocodingService] No results for '{location}'")
+                logger.debug("No results for '%s'", location)
                 return None
             
             else:
-                print(f"[GeocodingService] Geocoding API error: {data['status']}")
+                logger.warning("Geocoding API error: %s", data['status'])
                 return None
             
         except Exception as e:
-            print(f"[GeocodingService] Error geocoding '{location}': {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error geocoding '%s': %s", location, e, exc_info=True)
+            return None
+    
+    def _load_persisted(self, cache_key: tuple):
+        """Look a geocode up in the SQLite store, or None if absent or past _PERSIST_MAX_AGE"""
+        if self._db is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT value FROM geocodes WHERE key = ? AND stored_at > ?",
+                    (orjson.dumps(cache_key).decode(), time.time() - self._PERSIST_MAX_AGE)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("Geocode store read failed: %s", e)
             return None
+        return orjson.loads(row[0]) if row else None
+    
+    def _persist(self, cache_key: tuple, result) -> None:
+        """Record a geocode in the SQLite store (best effort)"""
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO geocodes (key, value, stored_at) VALUES (?, ?, ?)",
+                    (orjson.dumps(cache_key).decode(), orjson.dumps(result), time.time())
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Geocode store write failed: %s", e)
     
     def get_search_radius_km(self, place_type: str) -> float:
         """
@@ -151,7 +257,7 @@ class GeocodingService:
         }
         
         radius = radius_map.get(place_type, 10)  # Default 10km if unknown
-        print(f"[GeocodingService] Using {radius}km radius for place_type '{place_type}'")
+        logger.debug("Using %skm radius for place_type '%s'", radius, place_type)
         return radius
     
     def should_use_state_filter(self, place_type: str) -> bool:
@@ -178,19 +284,8 @@ class GeocodingService:
             Full state name (e.g., "New South Wales", "Victoria")
             or None if not found
         """
-        state_abbreviations = {
-            'NSW': 'New South Wales',
-            'VIC': 'Victoria',
-            'QLD': 'Queensland',
-            'SA': 'South Australia',
-            'WA': 'Western Australia',
-            'TAS': 'Tasmania',
-            'NT': 'Northern Territory',
-            'ACT': 'Australian Capital Territory'
-        }
-        
         # Check for state abbreviations
-        for abbrev, full_name in state_abbreviations.items():
+        for abbrev, full_name in STATE_ABBREVIATIONS.items():
             if abbrev in formatted_address or full_name in formatted_address:
                 return full_name
         
@@ -1,8 +1,68 @@
 """
 Response post-processor to ensure clean, user-friendly outputs
 """
+import logging
 import re
-import json
+import orjson
+
+# Debug trace goes through the api package logger set up in api.chatbot
+logger = logging.getLogger(__name__)
+
+# Patterns used on every response, compiled once at import
+
+# The "couldn't find ..." sentence kept when cleaning strips nearly everything
+_COULDNT_FIND_RE = re.compile(r'couldn\'t find[^\.]+\.', re.IGNORECASE)
+
+# Raw JSON: objects ({"key":"value"...}), arrays of objects, and other braced blocks
+_JSON_OBJECT_RE = re.compile(r'\{["\'][a-zA-Z_]+["\']:[^\}]{10,}\}')
+_JSON_ARRAY_RE = re.compile(r'\[\{[^\]]{20,}\}\]')
+_BRACED_RE = re.compile(r'\{[^\}]{5,}\}')
+
+# Sentences and fragments where the model narrates its own tool use
+_LEAKAGE_PATTERNS = (
+    # "I'll [action]..." sentences (all variations)
+    re.compile(r'I\'ll\s+(search|check|query|look|get|retrieve|find|call|fetch|access|contact|pull|grab)[^\n\.]+[\.\n]?', re.IGNORECASE),
+    # "I'm [action]..." sentences (all variations)
+    re.compile(r'I\'m\s+(searching|checking|querying|looking|getting|retrieving|finding|calling|fetching|accessing|contacting|pulling|grabbing)[^\n\.]+[\.\n]?', re.IGNORECASE),
+    # "Let me [action]..." sentences
+    re.compile(r'Let\s+me\s+(search|check|query|look|get|retrieve|find|call|fetch|access)[^\n\.]+[\.\n]?', re.IGNORECASE),
+    # "[Action]ing..." sentences (Searching, Querying, Calling, etc.)
+    re.compile(r'(Searching|Querying|Checking|Looking|Getting|Retrieving|Finding|Calling|Fetching|Accessing|Contacting|Attempting|Proceeding)[^\n]*[\.\n]', re.IGNORECASE),
+    # "Done/Finished..." sentences
+    re.compile(r'(Done|Finished)[^\n]*[\.\n]', re.IGNORECASE),
+    # Conditional process statements: "If I can [action]..."
+    re.compile(r'If\s+I\s+can\s+(retrieve|get|find|access|fetch|pull)[^\n\.]+[\.\n]?', re.IGNORECASE),
+    # Notes in parentheses
+    re.compile(r'\(Note:.*?\)[\.\n]?', re.IGNORECASE | re.DOTALL),
+    # "Calling function..." sentences
+    re.compile(r'Calling\s+(function|the\s+function|the\s+[A-Z][a-z]+\s+[A-Z][a-z]+)[^\n\.]+[\.\n]?', re.IGNORECASE),
+    # Specific pattern: "Calling the Australian Museum collection..."
+    re.compile(r'Calling\s+the\s+Australian\s+Museum[^\n\.]+[\.\n]?', re.IGNORECASE),
+    # Simulation notices
+    re.compile(r'\(this\s+is\s+simulated\)[\.\n]?', re.IGNORECASE),
+    # Function call patterns like: _call_function_
+    re.compile(r'_call_[a-z_]+_'),
+    # Pattern: (to=functions.name ...)
+    re.compile(r'\(to=functions\.[a-z_]+[^\)]*\)'),
+    # Multi-line search descriptions
+    re.compile(r'I\'ll[^\.]+\.+\s*Searching[^\n]*\n?', re.IGNORECASE),
+    # Remove "in case" conditional statements that describe process
+    re.compile(r'in\s+case\s+records?\s+(are|is)[^\n\.]+[\.\n]?', re.IGNORECASE),
+    # Remove phrases about retrieving/showing links
+    re.compile(r'(I\'ll\s+share\s+the\s+link|to\s+retrieve\s+the[^\n\.]+link)[^\n\.]*[\.\n]?', re.IGNORECASE),
+)
+
+# ALA search URLs, matched up to period+space (end of sentence), a newline, or a
+# lowercase word after a space. Spaces, brackets and other URL characters are allowed.
+_ALA_URL_RE = re.compile(r'https://biocache\.ala\.org\.au/occurrences/search[^\n]*?(?=\s+[a-z]|\.\s|\.?$|\n|$)')
+
+# Markdown images ![alt text](url), capturing the URL
+_MARKDOWN_IMAGE_RE = re.compile(r'!\[[^\]]*\]\((https?://[^\)]+)\)')
+
+# Orphaned JSON braces and runs of blank lines
+_ORPHAN_BRACE_LINE_RE = re.compile(r'^\s*[\{\}]\s*$', re.MULTILINE)
+_ORPHAN_CLOSE_BRACE_RE = re.compile(r'^\s*\}\s*\n', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n\n+')
 
 
 class ResponseCleaner:
@@ -44,7 +104,7 @@ class ResponseCleaner:
             if 'couldn\'t find' in original.lower() or 'no records' in original.lower() or '0 records' in original.lower():
                 # User query returned no results - preserve that information
                 if 'couldn\'t find' in original:
-                    match = re.search(r'couldn\'t find[^\.]+\.', original, re.IGNORECASE)
+                    match = _COULDNT_FIND_RE.search(original)
                     if match:
                         return match.group(0)
                 return "I couldn't find any matching records in the Australian Museum collection for that query."
@@ -53,80 +113,36 @@ class ResponseCleaner:
         
         # Log if we made significant changes
         if len(message) < len(original) * 0.7:
-            print(f"[ResponseCleaner] Significantly cleaned response (removed {len(original) - len(message)} chars)")
+            logger.debug("Significantly cleaned response (removed %s chars)", len(original) - len(message))
         
         return message
     
     def _remove_json_blocks(self, text: str) -> str:
         """Remove raw JSON that leaked into responses"""
         # Remove JSON objects (anything that looks like {"key":"value"...})
-        text = re.sub(r'\{["\'][a-zA-Z_]+["\']:[^\}]{10,}\}', '', text)
+        text = _JSON_OBJECT_RE.sub('', text)
         
         # Remove JSON arrays
-        text = re.sub(r'\[\{[^\]]{20,}\}\]', '', text)
+        text = _JSON_ARRAY_RE.sub('', text)
         
         # Remove standalone curly braces
-        text = re.sub(r'\{[^\}]{5,}\}', '', text)
+        text = _BRACED_RE.sub('', text)
         
         return text
     
     def _remove_function_leakage(self, text: str) -> str:
         """Remove function call leakage and search process descriptions - AGGRESSIVE"""
-        
         # Remove entire sentences that describe the search process
-        
-        # "I'll [action]..." sentences (all variations)
-        text = re.sub(r'I\'ll\s+(search|check|query|look|get|retrieve|find|call|fetch|access|contact|pull|grab)[^\n\.]+[\.\n]?', '', text, flags=re.IGNORECASE)
-        
-        # "I'm [action]..." sentences (all variations)
-        text = re.sub(r'I\'m\s+(searching|checking|querying|looking|getting|retrieving|finding|calling|fetching|accessing|contacting|pulling|grabbing)[^\n\.]+[\.\n]?', '', text, flags=re.IGNORECASE)
-        
-        # "Let me [action]..." sentences
-        text = re.sub(r'Let\s+me\s+(search|check|query|look|get|retrieve|find|call|fetch|access)[^\n\.]+[\.\n]?', '', text, flags=re.IGNORECASE)
-        
-        # "[Action]ing..." sentences (Searching, Querying, Calling, etc.)
-        text = re.sub(r'(Searching|Querying|Checking|Looking|Getting|Retrieving|Finding|Calling|Fetching|Accessing|Contacting|Attempting|Proceeding)[^\n]*[\.\n]', '', text, flags=re.IGNORECASE)
-        
-        # "Done/Finished..." sentences
-        text = re.sub(r'(Done|Finished)[^\n]*[\.\n]', '', text, flags=re.IGNORECASE)
-        
-        # Conditional process statements: "If I can [action]..."
-        text = re.sub(r'If\s+I\s+can\s+(retrieve|get|find|access|fetch|pull)[^\n\.]+[\.\n]?', '', text, flags=re.IGNORECASE)
-        
-        # Notes in parentheses
-        text = re.sub(r'\(Note:.*?\)[\.\n]?', '', text, flags=re.IGNORECASE | re.DOTALL)
-        
-        # "Calling function..." sentences
-        text = re.sub(r'Calling\s+(function|the\s+function|the\s+[A-Z][a-z]+\s+[A-Z][a-z]+)[^\n\.]+[\.\n]?', '', text, flags=re.IGNORECASE)
-        
-        # Specific pattern: "Calling the Australian Museum collection..."
-        text = re.sub(r'Calling\s+the\s+Australian\s+Museum[^\n\.]+[\.\n]?', '', text, flags=re.IGNORECASE)
-        
-        # Simulation notices
-        text = re.sub(r'\(this\s+is\s+simulated\)[\.\n]?', '', text, flags=re.IGNORECASE)
-        
-        # Function call patterns like: _call_function_
-        text = re.sub(r'_call_[a-z_]+_', '', text)
-        
-        # Pattern: (to=functions.name ...)
-        text = re.sub(r'\(to=functions\.[a-z_]+[^\)]*\)', '', text)
-        
-        # Multi-line search descriptions
-        text = re.sub(r'I\'ll[^\.]+\.+\s*Searching[^\n]*\n?', '', text, flags=re.IGNORECASE)
-        
-        # Remove "in case" conditional statements that describe process
-        text = re.sub(r'in\s+case\s+records?\s+(are|is)[^\n\.]+[\.\n]?', '', text, flags=re.IGNORECASE)
-        
-        # Remove phrases about retrieving/showing links
-        text = re.sub(r'(I\'ll\s+share\s+the\s+link|to\s+retrieve\s+the[^\n\.]+link)[^\n\.]*[\.\n]?', '', text, flags=re.IGNORECASE)
+        for pattern in _LEAKAGE_PATTERNS:
+            text = pattern.sub('', text)
         
         return text
     
     def _fix_urls(self, text: str, function_results: list) -> str:
         """Fix malformed ALA URLs by replacing with correct ones from function results"""
-        print(f"[ResponseCleaner] _fix_urls called")
-        print(f"[ResponseCleaner] Input text length: {len(text)}")
-        print(f"[ResponseCleaner] Input text preview: {text[:200]}...")
+        logger.debug("_fix_urls called")
+        logger.debug("Input text length: %s", len(text))
+        logger.debug("Input text preview: %s...", text[:200])
         
         # Extract the correct URL from the last function result
         correct_url = None
@@ -134,74 +150,66 @@ class ResponseCleaner:
         for result in reversed(function_results):
             try:
                 if result.get('role') == 'tool' and result.get('content'):
-                    data = json.loads(result['content'])
+                    data = orjson.loads(result['content'])
                     if 'ala_url' in data:
                         correct_url = data['ala_url']
-                        print(f"[ResponseCleaner] Found correct_url: {correct_url}")
-                        print(f"[ResponseCleaner] Bracket count in correct_url: {correct_url.count(']')}")
+                        logger.debug("Found correct_url: %s", correct_url)
+                        logger.debug("Bracket count in correct_url: %s", correct_url.count(']'))
                         break
             except Exception as e:
-                print(f"[ResponseCleaner] Error parsing result: {e}")
+                logger.debug("Error parsing result: %s", e)
                 continue
         
         if correct_url:
-            # IMPROVED REGEX: Match ALA URLs more precisely
-            # Stop at: period+space (end of sentence), newline, or closing paren not in URL
-            # Allow: spaces, brackets, and other URL characters
-            # This pattern will match until it hits ". " (period-space), "\n", or ")" at sentence end
-            ala_pattern = r'https://biocache\.ala\.org\.au/occurrences/search[^\n]*?(?=\s+[a-z]|\.\s|\.?$|\n|$)'
-            
             # Find all ALA URLs in the text
-            matches = re.findall(ala_pattern, text)
-            print(f"[ResponseCleaner] Found {len(matches)} URL(s) to replace")
+            matches = _ALA_URL_RE.findall(text)
+            logger.debug("Found %s URL(s) to replace", len(matches))
             
             if matches:
-                for i, match in enumerate(matches):
-                    print(f"[ResponseCleaner] Match {i+1}: {match}")
-                    print(f"[ResponseCleaner] Match {i+1} bracket count: {match.count(']')}")
-                    print(f"[ResponseCleaner] Match {i+1} last 30 chars: ...{match[-30:]}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    for i, match in enumerate(matches):
+                        logger.debug("Match %s: %s", i+1, match)
+                        logger.debug("Match %s bracket count: %s", i+1, match.count(']'))
+                        logger.debug("Match %s last 30 chars: ...%s", i+1, match[-30:])
                 
                 # Replace ALL ALA URLs with the correct one from backend
                 text_before = text
-                text = re.sub(ala_pattern, correct_url, text)
+                text = _ALA_URL_RE.sub(correct_url, text)
                 
-                print(f"[ResponseCleaner] ✓ Replaced {len(matches)} URL(s)")
-                print(f"[ResponseCleaner] Text changed: {text != text_before}")
+                logger.debug("✓ Replaced %s URL(s)", len(matches))
+                logger.debug("Text changed: %s", text != text_before)
                 
-                # Check the result
-                matches_after = re.findall(ala_pattern, text)
-                if matches_after:
-                    print(f"[ResponseCleaner] After replacement, found {len(matches_after)} URL(s)")
-                    for i, match in enumerate(matches_after):
-                        print(f"[ResponseCleaner] After match {i+1} bracket count: {match.count(']')}")
+                # Check the result (a second regex scan, so only when debugging)
+                if logger.isEnabledFor(logging.DEBUG):
+                    matches_after = _ALA_URL_RE.findall(text)
+                    if matches_after:
+                        logger.debug("After replacement, found %s URL(s)", len(matches_after))
+                        for i, match in enumerate(matches_after):
+                            logger.debug("After match %s bracket count: %s", i+1, match.count(']'))
         else:
             # Debug: Check if there are URLs but no correct URL from backend
-            ala_pattern = r'https://biocache\.ala\.org\.au/occurrences/search[^\n]*?(?=\s+[a-z]|\.\s|\.?$|\n|$)'
-            matches = re.findall(ala_pattern, text)
+            matches = _ALA_URL_RE.findall(text)
             if matches:
-                print(f"[ResponseCleaner] ⚠ WARNING: Found {len(matches)} ALA URL(s) but NO correct URL from backend!")
-                print(f"[ResponseCleaner]   This means the backend didn't return ala_url in function results")
-                print(f"[ResponseCleaner]   URL found: {matches[0][:80]}...")
+                logger.warning(
+                    "Found %s ALA URL(s) but no ala_url in the function results (first: %s...)",
+                    len(matches), matches[0][:80]
+                )
         
-        print(f"[ResponseCleaner] Output text preview: {text[:200]}...")
+        logger.debug("Output text preview: %s...", text[:200])
         return text
     
     def _convert_image_syntax(self, text: str) -> str:
         """Convert markdown image syntax ![alt text](url) to 'See image: url' format"""
-        # Pattern matches ![any alt text](url)
-        # Captures the URL inside the parentheses
-        pattern = r'!\[[^\]]*\]\((https?://[^\)]+)\)'
-        replacement = r'See image: \1'
-        return re.sub(pattern, replacement, text)
+        return _MARKDOWN_IMAGE_RE.sub(r'See image: \1', text)
     
     def _cleanup_formatting(self, text: str) -> str:
         """Clean up formatting issues"""
         # Remove orphaned JSON characters
-        text = re.sub(r'^\s*[\{\}]\s*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'^\s*\}\s*\n', '', text, flags=re.MULTILINE)
+        text = _ORPHAN_BRACE_LINE_RE.sub('', text)
+        text = _ORPHAN_CLOSE_BRACE_RE.sub('', text)
         
         # Remove multiple newlines
-        text = re.sub(r'\n\n+', '\n\n', text)
+        text = _BLANK_LINES_RE.sub('\n\n', text)
         
         # Remove leading/trailing whitespace from each line
         lines = [line.strip() for line in text.split('\n')]
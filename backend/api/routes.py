@@ -1,12 +1,17 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, Response, request, jsonify, session, stream_with_context
 from api.biocache import BiocacheService
 from api.chatbot import ChatbotService
+import base64
+import logging
+import orjson
 import uuid
 
+logger = logging.getLogger(__name__)
+
 # Blueprint setup
 api_bp = Blueprint("api", __name__)
 biocache_service = BiocacheService()
-chatbot_service = ChatbotService()
+chatbot_service = ChatbotService(biocache_service)  # one ALA connection pool for both
 
 # Your existing biocache routes remain unchanged
 @api_bp.route("/occurrences", methods=["GET"])
@@ -39,8 +44,8 @@ def get_occurrences():
         show_only_with_images_str = request.args.get("showOnlyWithImages", "true")
         show_only_with_images = show_only_with_images_str.lower() in ['true', '1', 'yes']
         
-        print(f"[ROUTES DEBUG] showOnlyWithImages parameter received: '{show_only_with_images_str}'")
-        print(f"[ROUTES DEBUG] Converted to boolean: {show_only_with_images}")
+        logger.debug("showOnlyWithImages parameter received: '%s'", show_only_with_images_str)
+        logger.debug("Converted to boolean: %s", show_only_with_images)
 
         # Spatial parameters
         lat = request.args.get("lat", type=float)
@@ -60,7 +65,7 @@ def get_occurrences():
         return jsonify(results), 200
 
     except Exception as e:
-        print(f"Error in /occurrences route: {e}")
+        logger.exception("Error in /occurrences route: %s", e)
         return jsonify({"error": str(e)}), 500
 
 
@@ -83,28 +88,7 @@ def chat():
     Supports both JSON and multipart/form-data
     """
     try:
-        # Get or create session ID
-        if 'session_id' not in session:
-            session['session_id'] = str(uuid.uuid4())
-        session_id = session['session_id']
-        
-        # Handle JSON request
-        if request.is_json:
-            data = request.json
-            message = data.get("message", "")
-            image_data = data.get("image")
-            custom_session_id = data.get("session_id", session_id)
-        
-        # Handle multipart/form-data request
-        else:
-            message = request.form.get("message", "")
-            image_data = None
-            custom_session_id = request.form.get("session_id", session_id)
-            
-            if "image" in request.files:
-                file = request.files["image"]
-                import base64
-                image_data = base64.b64encode(file.read()).decode("utf-8")
+        message, image_data, custom_session_id = _parse_chat_request()
         
         # Validate input
         if not message and not image_data:
@@ -123,9 +107,7 @@ def chat():
         return jsonify(response), 200
         
     except Exception as e:
-        print(f"Chat error: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Chat error: %s", e)
         return jsonify({
             "success": False,
             "error": str(e),
@@ -133,6 +115,73 @@ def chat():
         }), 500
 
 
+@api_bp.route("/chat/stream", methods=["POST"])
+def chat_stream():
+    """
+    Same input as /chat, answered as Server-Sent Events: "delta" events carry
+    text as the model writes it, then a final "done" (or "error") event carries
+    the same JSON body /chat returns
+    """
+    try:
+        message, image_data, custom_session_id = _parse_chat_request()
+        
+        if not message and not image_data:
+            return jsonify({
+                "success": False,
+                "error": "Either a message or an image is required"
+            }), 400
+        
+    except Exception as e:
+        logger.exception("Chat stream error: %s", e)
+        return jsonify({
+            "success": False,
+            "error": str(e),
+            "response": "I apologize, but I encountered an error. Please try again."
+        }), 500
+    
+    def generate():
+        for event in chatbot_service.process_message_stream(
+            message=message,
+            session_id=custom_session_id,
+            image_data=image_data
+        ):
+            name = event.pop("event")
+            yield f"event: {name}\ndata: {orjson.dumps(event).decode()}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _parse_chat_request():
+    """Read message, image and session ID from a JSON or multipart/form-data chat request"""
+    # Get or create session ID
+    if 'session_id' not in session:
+        session['session_id'] = str(uuid.uuid4())
+    session_id = session['session_id']
+    
+    # Handle JSON request
+    if request.is_json:
+        data = request.json
+        message = data.get("message", "")
+        image_data = data.get("image")
+        custom_session_id = data.get("session_id", session_id)
+    
+    # Handle multipart/form-data request
+    else:
+        message = request.form.get("message", "")
+        image_data = None
+        custom_session_id = request.form.get("session_id", session_id)
+        
+        if "image" in request.files:
+            file = request.files["image"]
+            image_data = base64.b64encode(file.read()).decode("utf-8")
+    
+    return message, image_data, custom_session_id
+
+
 @api_bp.route("/chat/suggestions", methods=["GET"])
 def get_suggestions():
     """Get chat suggestions"""
@@ -183,4 +232,8 @@ def get_chat_history():
 @api_bp.route("/health", methods=["GET"])
 def health_check():
     """Simple health check"""
-    return jsonify({"status": "healthy", "service": "museum-explorer-api"}), 200
\ No newline at end of file
+    return jsonify({
+        "status": "healthy",
+        "service": "museum-explorer-api",
+        "sessions": chatbot_service.get_session_stats()
+    }), 200
\ No newline at end of file
@@ -1,11 +1,70 @@
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from flask import Flask, request, make_response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from config import Config
 from api.routes import api_bp
+import orjson
 import os
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify/request.get_json through orjson - chat and search payloads carry large specimen lists"""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def configure_api_logging():
+    """
+    Debug trace of specimen searches, written to chatbot_debug.log in the working
+    directory when LOG_LEVEL=DEBUG (skipped entirely at higher levels). Handlers sit
+    on the "api" package logger so the chatbot, Biocache and geocoding traces all
+    land there. Runs once per process; the listener is stopped at exit so queued
+    records are flushed.
+    """
+    api_logger = logging.getLogger('api')
+    if any(isinstance(handler, QueueHandler) for handler in api_logger.handlers):
+        return
+    api_logger.setLevel(Config.LOG_LEVEL)
+    
+    debug_handler = RotatingFileHandler(
+        os.path.join(os.getcwd(), 'chatbot_debug.log'),
+        maxBytes=10_000_000,
+        backupCount=3,
+        delay=True
+    )
+    debug_handler.setLevel(logging.DEBUG)
+    # Errors (with tracebacks) still go to stderr so they show up in the server logs
+    error_handler = logging.StreamHandler(sys.stderr)
+    error_handler.setLevel(logging.WARNING)
+    
+    # Request threads only enqueue records; file and stderr writes happen on the
+    # listener's background thread
+    log_queue = queue.SimpleQueue()
+    api_logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, debug_handler, error_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+
 def create_app():
+    configure_api_logging()
+    
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
     app.config.from_object(Config)
     
     # TEMPORARY: Allow ALL origins to fix CORS issues
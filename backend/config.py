@@ -19,6 +19,18 @@ class Config:
     # CORS settings
     CORS_ORIGINS = ["http://localhost:3000"]
     
+    # Logging - set LOG_LEVEL=DEBUG to write the chatbot debug trace
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+    
+    # Session storage - set REDIS_URL to share chat sessions across gunicorn workers
+    REDIS_URL = os.environ.get('REDIS_URL', '')
+    
+    # SQLite file persisting BIE common/scientific name lookups - set to '' to disable
+    NAME_CACHE_DB = os.environ.get('NAME_CACHE_DB', 'name_cache.db')
+    
+    # SQLite file persisting Google geocoding results - set to '' to disable
+    GEOCODE_CACHE_DB = os.environ.get('GEOCODE_CACHE_DB', 'geocode_cache.db')
+    
     # Cache settings
     CACHE_TYPE = "simple"
     CACHE_DEFAULT_TIMEOUT = 300
\ No newline at end of file
@@ -7,8 +7,10 @@ timeout = 120
 # Number of worker processes
 workers = 2
 
-# Worker class
-worker_class = 'sync'
+# Worker class - threads let one worker serve other chats while a request
+# waits on OpenAI / ALA network I/O (the app is synchronous Flask, not asyncio)
+worker_class = 'gthread'
+threads = 8
 
 # Bind address
 bind = '0.0.0.0:5000'
@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useRef } from 'react';
 import './Chatbot.css';
-import { sendChatMessage, getChatSuggestions } from '../../services/api';
+import { streamChatMessage, getChatSuggestions } from '../../services/api';
 import posthog from 'posthog-js';
 
 function Chatbot() {
@@ -257,23 +257,43 @@ function Chatbot() {
     
     setIsLoading(true);
 
+    // The answer streams into a placeholder message as it is generated; the final
+    // response (cleaned up by the backend) then replaces the placeholder
+    let streamedText = '';
+    let streamStarted = false;
+    const replaceOrAppend = (assistantMessage) => {
+      // Read the flag now - React may run the updater after it has changed
+      const replace = streamStarted;
+      setMessages(prev => replace
+        ? [...prev.slice(0, -1), assistantMessage]
+        : [...prev, assistantMessage]);
+    };
+
     try {
       // Send message to backend
-      const response = await sendChatMessage(
+      const response = await streamChatMessage(
         message, 
         { session_id: sessionId }, 
-        imageToSend
+        imageToSend,
+        (delta) => {
+          streamedText += delta;
+          replaceOrAppend({ type: 'assistant', text: streamedText });
+          if (!streamStarted) {
+            streamStarted = true;
+            setIsLoading(false);
+          }
+        }
       );
 
       const responseTime = Date.now() - messageStartTime;
 
       // Handle response
-      if (response.success) {
+      if (response && response.success) {
         const assistantMessage = {
           type: 'assistant',
           text: response.response
         };
-        setMessages(prev => [...prev, assistantMessage]);
+        replaceOrAppend(assistantMessage);
 
         // Track bot response received
         posthog.capture('chatbot_bot_response', {
@@ -291,7 +311,7 @@ function Chatbot() {
           setSuggestions(response.suggestions.slice(0, 3));
         }
       } else {
-        throw new Error(response.error || 'Unknown error');
+        throw new Error((response && response.error) || 'Unknown error');
       }
     } catch (error) {
       console.error('Error sending message:', error);
@@ -309,7 +329,7 @@ function Chatbot() {
         type: 'assistant',
         text: "I apologize, but I encountered an error. Please try again."
       };
-      setMessages(prev => [...prev, errorMessage]);
+      replaceOrAppend(errorMessage);
     } finally {
       setIsLoading(false);
     }
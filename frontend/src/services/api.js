@@ -78,6 +78,84 @@ export const sendChatMessage = async (message, context = {}, imageData = null) =
   }
 };
 
+/**
+ * Send a chat message and receive the answer as it is generated
+ * (Server-Sent Events from /api/chat/stream)
+ * @param {string} message - Text message
+ * @param {object} context - Context object with session_id
+ * @param {string} imageData - Base64 encoded image data (optional)
+ * @param {function} onDelta - Called with each chunk of answer text
+ * @returns {object} The same response body /api/chat returns
+ */
+export const streamChatMessage = async (message, context = {}, imageData = null, onDelta = () => {}) => {
+  const payload = {
+    message: message || '',
+    session_id: context.session_id || 'default'
+  };
+  
+  if (imageData) {
+    payload.image = imageData.includes(',') ? imageData.split(',')[1] : imageData;
+  }
+  
+  const response = await fetch(`${API_BASE_URL}/api/chat/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(payload)
+  });
+  
+  if (!response.ok) {
+    throw new Error(`Chat stream failed with status ${response.status}`);
+  }
+  
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let result = null;
+  
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    
+    // Events are separated by a blank line: "event: <name>\ndata: <json>"
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      
+      let eventName = 'message';
+      let data = '';
+      rawEvent.split('\n').forEach((line) => {
+        if (line.startsWith('event: ')) eventName = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      });
+      
+      // Comments, keep-alives and anything a proxy injects carry no JSON payload
+      if (!data) continue;
+      
+      let body;
+      try {
+        body = JSON.parse(data);
+      } catch (error) {
+        console.warn('Skipping malformed chat stream event:', data);
+        continue;
+      }
+      
+      if (eventName === 'delta') {
+        onDelta(body.content);
+      } else {
+        result = body;
+      }
+    }
+  }
+  
+  if (!result) {
+    throw new Error('Chat stream ended before the final event');
+  }
+  
+  return result;
+};
+
 /**
  * Get chat suggestions
  */